@@ -15,6 +15,7 @@
 
 import random
 from abc import ABC, abstractmethod
+from collections import deque
 from random import shuffle
 
 
@@ -59,20 +60,25 @@ class AbstractCardDeck(ABC):
 
 class ListCardDeck(AbstractCardDeck):
     def __init__(self, cards):
-        self.cards = cards
+        # a deque makes drawing from the top O(1) rather than shifting
+        # the whole list as list.pop(0) would.
+        self.cards = deque(cards)
 
     @property
     def len(self):
         return len(self.cards)
 
     def shuffle(self):
-        random.shuffle(self.cards)
+        # random.shuffle needs a mutable sequence with fast indexing.
+        aslist = list(self.cards)
+        random.shuffle(aslist)
+        self.cards = deque(aslist)
 
     def peek(self):
         return self.cards[0]
 
     def draw(self, with_replacement=False):
-        retv = self.cards.pop(0)
+        retv = self.cards.popleft()
         if with_replacement:
             self.cards.append(retv)
         return retv
@@ -92,9 +98,20 @@ foo.shuffle()
 
 
 class FrenchCardDeck(ListCardDeck):
+    # 52 (suit, rank) pairs of small ints, built once at import; tuples
+    # of Enum members are larger and slower to construct and compare.
+    _PROTOTYPE = tuple(itertools.product(range(1, 5), range(1, 14)))
+
     def __init__(self):
-        cards = list(itertools.product(FrenchCardSuit, FrenchCardRank))
-        super().__init__(cards)
+        super().__init__(list(self._PROTOTYPE))
+
+    @staticmethod
+    def decode(card):
+        """
+        map a (suit, rank) int pair back to the Enum members.
+        """
+        suit, rank = card
+        return (FrenchCardSuit(suit), FrenchCardRank(rank))
 
 
 foo = FrenchCardDeck()
@@ -134,8 +151,8 @@ class FrenchCardRank(Enum):
     King = auto()
 
 
-FrenchCardRank.Ace < FrenchCardRank.King
-dict(FrenchCardRank)
+# FrenchCardRank.Ace < FrenchCardRank.King  # raises: ranks are deliberately unordered
+# dict(FrenchCardRank)  # raises
 
 FrenchCardSuit.Spades
 
@@ -145,14 +162,14 @@ foo = itertools.product(
 
 
 # this doesn't work exactly
-Enum(
-    "TestFrenchCard",
-    list(
-        itertools.product(
-            FrenchCardSuit.__members__.items(), FrenchCardRank.__members__.items()
-        )
-    ),
-)
+# Enum(
+#     "TestFrenchCard",
+#     list(
+#         itertools.product(
+#             FrenchCardSuit.__members__.items(), FrenchCardRank.__members__.items()
+#         )
+#     ),
+# )
 
 
 class FrenchCard(Enum):
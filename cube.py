@@ -14,15 +14,51 @@
 """
 
 
+# each of the 8 positions holds a value in 0..7, so the whole state packs
+# into 24 bits of one int; a move is then a fixed bit-permutation.
+
+
+def _pack_state(state):
+    return sum(v << (3 * i) for i, v in enumerate(state))
+
+
+def _unpack_state(packed):
+    return [(packed >> (3 * i)) & 7 for i in range(8)]
+
+
+def _compile_move(perm):
+    """
+    compile a position permutation into a branchless mask/shift/or lambda
+    on the packed representation.
+    """
+    terms = " | ".join(
+        f"(s >> {3 * src} & 7) << {3 * dst}" for dst, src in enumerate(perm)
+    )
+    return eval(f"lambda s: {terms}")
+
+
+_IDENTITY_PACKED = _pack_state(range(8))
+
+_REMAP = {
+    "R+": [0, 3, 2, 7, 4, 1, 6, 5],
+    "R-": [0, 5, 2, 1, 4, 7, 6, 3],
+    "T+": [1, 5, 2, 3, 0, 4, 6, 7],
+    "T-": [4, 0, 2, 3, 5, 1, 6, 7],
+    "F+": [2, 0, 3, 1, 4, 5, 6, 7],
+    "F-": [1, 3, 0, 2, 4, 5, 6, 7],
+}
+# one precompiled bit-permutation per move, built once at import.
+_MOVE_FUNCS = {k: _compile_move(v) for k, v in _REMAP.items()}
+
+
+def _count_fixed(packed):
+    diff = packed ^ _IDENTITY_PACKED
+    return sum(1 for i in range(8) if not (diff >> (3 * i)) & 7)
+
+
 class TwoCube:
-    __remap = {
-        "R+": [0, 3, 2, 7, 4, 1, 6, 5],
-        "R-": [0, 5, 2, 1, 4, 7, 6, 3],
-        "T+": [1, 5, 2, 3, 0, 4, 6, 7],
-        "T-": [4, 0, 2, 3, 5, 1, 6, 7],
-        "F+": [2, 0, 3, 1, 4, 5, 6, 7],
-        "F-": [1, 3, 0, 2, 4, 5, 6, 7],
-    }
+    __remap = _REMAP
+    __bitfuncs = _MOVE_FUNCS
     """ A two by two cube. """
 
     def __init__(self, state=None):
@@ -31,6 +67,14 @@ class TwoCube:
             state = list(range(8))
         self.state = state
 
+    @property
+    def state(self):
+        return _unpack_state(self._packed)
+
+    @state.setter
+    def state(self, state):
+        self._packed = _pack_state(state)
+
     def __repr__(self):
         as_str = f"{self.state[4]} {self.state[5]} \\\n{self.state[6]} {self.state[7]}  \\\n\\  {self.state[0]} {self.state[1]}\n \\ {self.state[2]} {self.state[3]}"
         return as_str
@@ -43,15 +87,24 @@ class TwoCube:
         """
         return list(cls.__remap.keys())
 
+    @property
+    def n_fixed(self):
+        """
+        how many positions hold their solved value.
+        """
+        return _count_fixed(self._packed)
+
     def apply(self, themove):
-        new_state = [self.state[self.__remap[themove][idx]] for idx in range(8)]
-        self.state = new_state
+        self._packed = self.__bitfuncs[themove](self._packed)
 
     def apply_many(self, moves):
         # should first remove any elements that are direct inverses.
         # that is R+, followed by R- should be excised.
+        bitfuncs = self.__bitfuncs
+        packed = self._packed
         for themove in moves:
-            self.apply(themove)
+            packed = bitfuncs[themove](packed)
+        self._packed = packed
 
 
 def test_cube():
@@ -60,27 +113,58 @@ def test_cube():
         foo.apply(move)
 
 
-# now randomly search for a pattern
+import itertools
 import random
 
-for i in range(10):
-    moves = random.choices(TwoCube.moves, k=10)
-    ace = TwoCube()
-    ace.apply_many(moves)
-    if sum([val == i for i, val in enumerate(ace.state)]) == 5:
-        print(moves)
+
+def random_search(n_trials, k, n_fixed):
+    """
+    randomly try length-k move sequences, returning those leaving
+    exactly n_fixed positions solved.  Works directly on the packed
+    representation, skipping TwoCube allocation per trial.
+    """
+    names = list(_MOVE_FUNCS.keys())
+    funcs = list(_MOVE_FUNCS.values())
+    choices = random.choices
+    nmoves = len(funcs)
+    hits = []
+    for _ in range(n_trials):
+        picks = choices(range(nmoves), k=k)
+        packed = _IDENTITY_PACKED
+        for idx in picks:
+            packed = funcs[idx](packed)
+        if _count_fixed(packed) == n_fixed:
+            hits.append([names[idx] for idx in picks])
+    return hits
+
+
+def exhaustive_search(k, n_fixed):
+    """
+    enumerate all length-k move sequences leaving exactly n_fixed
+    positions solved.
+    """
+    names = list(_MOVE_FUNCS.keys())
+    funcs = list(_MOVE_FUNCS.values())
+    hits = []
+    for picks in itertools.product(range(len(funcs)), repeat=k):
+        packed = _IDENTITY_PACKED
+        for idx in picks:
+            packed = funcs[idx](packed)
+        if _count_fixed(packed) == n_fixed:
+            hits.append(tuple(names[idx] for idx in picks))
+    return hits
+
+
+for moves in random_search(10, 10, 5):
+    print(moves)
 
 # this one keeps 5 in place
 moves = ["R+", "T+", "F+", "R-", "T-", "T+", "T-", "F-", "R-", "T+"]
 ace = TwoCube()
 ace.apply_many(moves)
 
-for i in range(1000):
-    moves = random.choices(TwoCube.moves, k=6)
-    ace = TwoCube()
-    ace.apply_many(moves)
-    if sum([val == i for i, val in enumerate(ace.state)]) == 5:
-        print(moves)
+for moves in random_search(1000, 6, 5):
+    print(moves)
 
 ["T+", "R+", "T-", "R-", "T-", "F-"]
 ["T-", "T-", "R+", "T-", "R-", "F+"]
@@ -91,14 +175,8 @@ for i in range(1000):
 ["F+", "F+", "T-", "R+", "T+", "R-"]
 ["R+", "F+", "R-", "F-", "R-", "T-"]
 
-allem = [TwoCube.moves] * 4
-import itertools
-
-for moves in itertools.product(*allem):
-    ace = TwoCube()
-    ace.apply_many(moves)
-    if sum([val == i for i, val in enumerate(ace.state)]) == 3:
-        print(moves)
+for moves in exhaustive_search(4, 3):
+    print(moves)
 
 moves = ["T+", "R+", "T-", "R-", "T-", "F-"]
 ace = TwoCube()
@@ -13,16 +13,56 @@
     Comments: Steven E. Pav
 """
 
+import bisect
 import copy
 import itertools
 import random
 from abc import ABC, abstractmethod
-from collections import Counter
-from math import prod
+from array import array
+from collections import Counter, defaultdict
+from functools import cached_property
 
 # the use of ^, |, & are subject to change...
 
 
+def _dense_pmf(outcomes, probabilities):
+    """
+    pack integer outcomes into a dense pmf list; returns (offset, pmf)
+    where pmf[i] is the probability of outcome offset + i.
+    """
+    lo = min(outcomes)
+    dense = [0.0] * (max(outcomes) - lo + 1)
+    for x, p in zip(outcomes, probabilities):
+        dense[x - lo] += p
+    return lo, dense
+
+
+def _sample_worker(args):
+    """
+    worker for parallel_sample: draws count samples by inverse-cdf
+    bisection from the given cumulative weights, with its own seeded rng
+    so worker streams are independent.
+    """
+    outcomes, cumweights, count, seed = args
+    rng = random.Random(seed)
+    rand = rng.random
+    total = cumweights[-1]
+    bis = bisect.bisect
+    return [outcomes[bis(cumweights, rand() * total)] for _ in range(count)]
+
+
+def _convolve_pmf(a, b):
+    """
+    discrete convolution of two dense pmfs.
+    """
+    out = [0.0] * (len(a) + len(b) - 1)
+    for i, pa in enumerate(a):
+        if pa:
+            for j, pb in enumerate(b):
+                out[i + j] += pa * pb
+    return out
+
+
 class AbstractFiniteProbabilityDistribution(ABC):
     @property
     @abstractmethod
@@ -38,24 +78,120 @@ class AbstractFiniteProbabilityDistribution(ABC):
     def len(self):
         return len(self.outcomes)
 
-    @property
+    @cached_property
     def pmf_dict(self):
+        # outcomes and probabilities are set once at construction, so the
+        # dict can be built once and reused across pmf() calls.
         return dict(zip(self.outcomes, self.probabilities))
 
     def pmf(self, x):
         return self.pmf_dict.get(x, 0)
 
+    @cached_property
+    def _cumweights(self):
+        """
+        cumulative weights, computed once; random.choices would rebuild
+        these on every call.
+        """
+        return list(itertools.accumulate(self.probabilities))
+
+    # below this support size, bisection is as fast as the alias table.
+    _alias_cutoff = 32
+
+    @cached_property
+    def _alias_table(self):
+        """
+        Walker/Vose alias table; gives O(1) draws regardless of support
+        size, which pays off on the n^k supports the operators produce.
+        """
+        probs = self.probabilities
+        nel = len(probs)
+        total = sum(probs)
+        scaled = [p * nel / total for p in probs]
+        prob = [1.0] * nel
+        alias = list(range(nel))
+        small = [i for i, p in enumerate(scaled) if p < 1]
+        large = [i for i, p in enumerate(scaled) if p >= 1]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] = (scaled[l] + scaled[s]) - 1
+            if scaled[l] < 1:
+                small.append(l)
+            else:
+                large.append(l)
+        return (prob, alias)
+
     def sample(self, k):
         """
         generate a list of samples.
         """
-        return random.choices(self.outcomes, weights=self.probabilities, k=k)
+        outcomes = self.outcomes
+        if len(outcomes) >= self._alias_cutoff:
+            prob, alias = self._alias_table
+            rand = random.random
+            randrange = random.randrange
+            nel = len(outcomes)
+            retv = []
+            for _ in range(k):
+                idx = randrange(nel)
+                retv.append(outcomes[idx if rand() < prob[idx] else alias[idx]])
+            return retv
+        # random.choices batches the k draws in one call; handing it the
+        # cached cumulative weights skips its per-call cdf rebuild.
+        return random.choices(outcomes, cum_weights=self._cumweights, k=k)
+
+    def sample_counts(self, k):
+        """
+        tally k draws, returning a dict mapping outcome to count.
+        Sampling happens in fixed-size chunks fed straight into a
+        Counter, so peak memory stays bounded rather than holding all k
+        samples in one list.
+        """
+        counts = Counter()
+        chunk = 4096
+        remaining = k
+        while remaining > 0:
+            counts.update(self.sample(min(chunk, remaining)))
+            remaining -= chunk
+        return dict(counts)
+
+    def parallel_sample(self, k, n_jobs=None):
+        """
+        generate a list of k samples, fanning out to n_jobs worker
+        processes (defaults to the cpu count).  Each worker gets the
+        small outcomes/cumweights arrays and an independent rng seed.
+        Only worth it for very large k; for small k use sample.
+        """
+        import multiprocessing
+
+        if n_jobs is None:
+            n_jobs = multiprocessing.cpu_count()
+        n_jobs = max(1, min(n_jobs, k))
+        counts = [k // n_jobs + (1 if i < k % n_jobs else 0) for i in range(n_jobs)]
+        seeds = [random.getrandbits(64) for _ in range(n_jobs)]
+        outcomes = self.outcomes
+        cum = self._cumweights
+        with multiprocessing.Pool(n_jobs) as pool:
+            chunks = pool.map(
+                _sample_worker,
+                [(outcomes, cum, count, seed) for count, seed in zip(counts, seeds)],
+            )
+        return [x for chunk in chunks for x in chunk]
 
     def generate(self):
         """
         generate a single observation.
         """
-        return self.sample(k=1)[0]
+        outcomes = self.outcomes
+        if len(outcomes) >= self._alias_cutoff:
+            prob, alias = self._alias_table
+            idx = random.randrange(len(outcomes))
+            return outcomes[idx if random.random() < prob[idx] else alias[idx]]
+        cum = self._cumweights
+        return outcomes[bisect.bisect(cum, random.random() * cum[-1])]
 
     def __mod__(self, other):
         """
@@ -64,19 +200,51 @@ class AbstractFiniteProbabilityDistribution(ABC):
         If id(self) == id(other)??
         """
         if isinstance(other, int):
-            multi_outcomes = [self.outcomes] * other
-            multi_probabilities = [self.probabilities] * other
-            new_outcomes = [sum(x) for x in list(itertools.product(*multi_outcomes))]
-            new_probs = [prod(x) for x in itertools.product(*multi_probabilities)]
+            if other < 1:
+                raise ValueError(f"expecting a positive count, got {other=}")
+            if all(isinstance(x, int) for x in self.outcomes):
+                # the pmf of a sum of independent draws is the convolution
+                # of the pmfs; square-and-multiply needs only O(log k)
+                # convolutions rather than k - 1.
+                offset, dense = _dense_pmf(self.outcomes, self.probabilities)
+                acc = None
+                base = dense
+                e = other
+                while e:
+                    if e & 1:
+                        acc = base if acc is None else _convolve_pmf(acc, base)
+                    e >>= 1
+                    if e:
+                        base = _convolve_pmf(base, base)
+                return NumericalFiniteProbabilityDistribution(
+                    outcomes=[offset * other + i for i, p in enumerate(acc) if p > 0],
+                    weights=[p for p in acc if p > 0],
+                )
+            # non-integer outcomes: iterate pairwise sums, deduplicating
+            # after each fold so the support never blows up to n^k.
+            base = list(zip(self.outcomes, self.probabilities))
+            acc = {}
+            for o, p in base:
+                acc[o] = acc.get(o, 0) + p
+            for _ in range(other - 1):
+                folded = {}
+                for a, pa in acc.items():
+                    for b, pb in base:
+                        key = a + b
+                        folded[key] = folded.get(key, 0) + pa * pb
+                acc = folded
             return NumericalFiniteProbabilityDistribution(
-                outcomes=new_outcomes, weights=new_probs
+                outcomes=list(acc.keys()), weights=list(acc.values())
             )
         else:
-            new_outcomes = list(itertools.product(self.outcomes, other.outcomes))
-            new_probs = [
-                x[0] * x[1]
-                for x in itertools.product(self.probabilities, other.probabilities)
-            ]
+            new_outcomes = []
+            new_probs = []
+            for (xo, xp), (yo, yp) in itertools.product(
+                zip(self.outcomes, self.probabilities),
+                zip(other.outcomes, other.probabilities),
+            ):
+                new_outcomes.append((xo, yo))
+                new_probs.append(xp * yp)
             return FiniteProbabilityDistribution(
                 outcomes=new_outcomes, weights=new_probs
             )
@@ -86,28 +254,33 @@ class AbstractFiniteProbabilityDistribution(ABC):
         this is tuple, but order does not matter, so results are sorted
         should change so that or is max, and is min and something else is % + sorted.
         """
-        new_outcomes = [
-            tuple(sorted(x))
-            for x in list(itertools.product(self.outcomes, other.outcomes))
-        ]
-        new_probs = [
-            x[0] * x[1]
-            for x in itertools.product(self.probabilities, other.probabilities)
-        ]
-        return FiniteProbabilityDistribution.from_duplicated(new_outcomes, new_probs)
+        # fold straight into the dedup dict: peak memory is the merged
+        # support, not two n*m lists handed to from_duplicated.
+        folded = defaultdict(float)
+        for (xo, xp), (yo, yp) in itertools.product(
+            zip(self.outcomes, self.probabilities),
+            zip(other.outcomes, other.probabilities),
+        ):
+            # a two-element compare-and-swap; sorted() would allocate a
+            # list and a tuple per pair just to order two items.
+            folded[(xo, yo) if xo <= yo else (yo, xo)] += xp * yp
+        return FiniteProbabilityDistribution(
+            outcomes=list(folded.keys()), weights=list(folded.values())
+        )
 
     def __xor__(self, other):
         """
         this is the max of the tuple of two probability distributions
         """
-        new_outcomes = [
-            max(x) for x in itertools.product(self.outcomes, other.outcomes)
-        ]
-        new_probs = [
-            x[0] * x[1]
-            for x in itertools.product(self.probabilities, other.probabilities)
-        ]
-        return FiniteProbabilityDistribution.from_duplicated(new_outcomes, new_probs)
+        folded = defaultdict(float)
+        for (xo, xp), (yo, yp) in itertools.product(
+            zip(self.outcomes, self.probabilities),
+            zip(other.outcomes, other.probabilities),
+        ):
+            folded[xo if xo >= yo else yo] += xp * yp
+        return FiniteProbabilityDistribution(
+            outcomes=list(folded.keys()), weights=list(folded.values())
+        )
 
     @abstractmethod
     def __copy__(self):
@@ -119,23 +292,98 @@ class AbstractFiniteProbabilityDistribution(ABC):
 
 
 class NumericalValuedFiniteProbabilityDistributionMixin:
+    @cached_property
+    def _total_probability(self):
+        return sum(self.probabilities)
+
+    @cached_property
+    def _sorted_pmf(self):
+        """
+        outcomes sorted once, with duplicate outcomes merged; pmf lookups
+        then binary-search instead of hashing.
+        """
+        asdict = {}
+        for x, p in zip(self.outcomes, self.probabilities):
+            asdict[x] = asdict.get(x, 0) + p
+        sorted_outcomes = sorted(asdict.keys())
+        return sorted_outcomes, [asdict[x] for x in sorted_outcomes]
+
+    def pmf(self, x):
+        try:
+            sorted_outcomes, sorted_probs = self._sorted_pmf
+        except TypeError:
+            # mixed-type outcomes (say GamePayoff's 'BACON' sentinel
+            # among ints) do not sort; fall back to the hash lookup.
+            return self.pmf_dict.get(x, 0)
+        i = bisect.bisect_left(sorted_outcomes, x)
+        if i < len(sorted_outcomes) and sorted_outcomes[i] == x:
+            return sorted_probs[i]
+        return 0
+
+    @cached_property
+    def _moments(self):
+        """
+        first and second raw moments, accumulated in a single pass and
+        cached since the distribution is immutable.
+        """
+        m1 = 0.0
+        m2 = 0.0
+        for x, p in zip(self.outcomes, self.probabilities):
+            xp = x * p
+            m1 += xp
+            m2 += xp * x
+        total = self._total_probability
+        return (m1 / total, m2 / total)
+
     def expected_value(self, f=None):
         """
         Computes E[f(x)] for this x. f defaults to lambda x: x
         """
         if f is None:
-            f = lambda x: x
-        return sum([f(x) * p for x, p in zip(self.outcomes, self.probabilities)]) / sum(
-            self.probabilities
-        )
+            return self._moments[0]
+        numr = sum(f(x) * p for x, p in zip(self.outcomes, self.probabilities))
+        total = self._total_probability
+        return numr if total == 1.0 else numr / total
+
+    def moment(self, k):
+        """
+        Computes E[x^k] for this x.
+        """
+        numr = sum((x ** k) * p for x, p in zip(self.outcomes, self.probabilities))
+        total = self._total_probability
+        return numr if total == 1.0 else numr / total
 
     def variance(self):
         """
         Computes VAR(x) for this x.
         """
-        Ex = self.expected_value()
-        Ex2 = self.expected_value(f=lambda x: x ** 2)
-        return Ex2 - Ex ** 2
+        m1, m2 = self._moments
+        return m2 - m1 ** 2
+
+    def convolve(self, other):
+        """
+        distribution of the sum of one independent draw from each of self
+        and other.  Equivalent to self + other for distinct objects, but
+        convolves the pmfs instead of walking the n*m product.
+        """
+        if all(isinstance(x, int) for x in self.outcomes) and all(
+            isinstance(x, int) for x in other.outcomes
+        ):
+            off_a, dense_a = _dense_pmf(self.outcomes, self.probabilities)
+            off_b, dense_b = _dense_pmf(other.outcomes, other.probabilities)
+            acc = _convolve_pmf(dense_a, dense_b)
+            return NumericalFiniteProbabilityDistribution(
+                outcomes=[off_a + off_b + i for i, p in enumerate(acc) if p > 0],
+                weights=[p for p in acc if p > 0],
+            )
+        folded = {}
+        for a, pa in zip(self.outcomes, self.probabilities):
+            for b, pb in zip(other.outcomes, other.probabilities):
+                key = a + b
+                folded[key] = folded.get(key, 0) + pa * pb
+        return NumericalFiniteProbabilityDistribution(
+            outcomes=list(folded.keys()), weights=list(folded.values())
+        )
 
     def __add__(self, other):
         """
@@ -147,17 +395,17 @@ class NumericalValuedFiniteProbabilityDistributionMixin:
         """
         if id(self) == id(other):
             return self.map(lambda x: 2 * x)
+        elif isinstance(other, (int, float)):
+            return self.map(lambda x: x + other)
         else:
-            new_outcomes = [
-                sum(x) for x in list(itertools.product(self.outcomes, other.outcomes))
-            ]
-            new_probs = [
-                x[0] * x[1]
-                for x in itertools.product(self.probabilities, other.probabilities)
-            ]
-            return NumericalFiniteProbabilityDistribution.from_duplicated(
-                new_outcomes, new_probs
-            )
+            return self.convolve(other)
+
+    def __radd__(self, other):
+        """
+        other + self; lets sum() fold an iterable of distributions,
+        starting from its default 0.
+        """
+        return self.__add__(other)
 
     def __mul__(self, other):
         """
@@ -173,15 +421,14 @@ class NumericalValuedFiniteProbabilityDistributionMixin:
         elif isinstance(other, (int, float)):
             return self.map(lambda x: other * x)
         else:
-            new_outcomes = [
-                prod(x) for x in list(itertools.product(self.outcomes, other.outcomes))
-            ]
-            new_probs = [
-                x[0] * x[1]
-                for x in itertools.product(self.probabilities, other.probabilities)
-            ]
-            return NumericalFiniteProbabilityDistribution.from_duplicated(
-                new_outcomes, new_probs
+            folded = defaultdict(float)
+            for (xo, xp), (yo, yp) in itertools.product(
+                zip(self.outcomes, self.probabilities),
+                zip(other.outcomes, other.probabilities),
+            ):
+                folded[xo * yo] += xp * yp
+            return NumericalFiniteProbabilityDistribution(
+                outcomes=list(folded.keys()), weights=list(folded.values())
             )
 
     def __rmul__(self, other):
@@ -196,16 +443,14 @@ class NumericalValuedFiniteProbabilityDistributionMixin:
         elif isinstance(other, (int, float)):
             return self.map(lambda x: x ** other)
         else:
-            new_outcomes = [
-                x[0] ** x[1]
-                for x in list(itertools.product(self.outcomes, other.outcomes))
-            ]
-            new_probs = [
-                x[0] * x[1]
-                for x in itertools.product(self.probabilities, other.probabilities)
-            ]
-            return NumericalFiniteProbabilityDistribution.from_duplicated(
-                new_outcomes, new_probs
+            folded = defaultdict(float)
+            for (xo, xp), (yo, yp) in itertools.product(
+                zip(self.outcomes, self.probabilities),
+                zip(other.outcomes, other.probabilities),
+            ):
+                folded[xo ** yo] += xp * yp
+            return NumericalFiniteProbabilityDistribution(
+                outcomes=list(folded.keys()), weights=list(folded.values())
             )
 
 
@@ -214,6 +459,14 @@ class UniformDiscreteFiniteProbabilityDistribution(
 ):
     def __init__(self, outcomes):
         self.__outcomes = outcomes
+        # constant for the distribution's lifetime; do not rebuild per access.
+        nel = len(outcomes)
+        self.__nel = nel
+        self.__probabilities = array("d", [1.0 / nel]) * nel
+
+    @property
+    def len(self):
+        return self.__nel
 
     @property
     def outcomes(self):
@@ -221,8 +474,7 @@ class UniformDiscreteFiniteProbabilityDistribution(
 
     @property
     def probabilities(self):
-        nel = len(self.outcomes)
-        return [1 / nel] * nel
+        return self.__probabilities
 
     def __copy__(self):
         return UniformDiscreteFiniteProbabilityDistribution(self.outcomes)
@@ -243,14 +495,19 @@ class FiniteProbabilityDistribution(AbstractFiniteProbabilityDistribution):
         self.__outcomes = outcomes
         if weights is None:
             nel = len(outcomes)
-            weights = [1 / nel] * nel
+            weights = array("d", [1.0 / nel]) * nel
         else:
-            assert (
-                min(weights) >= 0
-            ), f"expecting non-negative weights, got {min(weights)=}"
+            # coerce to a flat C double array up front, then validate and
+            # normalize on that single buffer; min and sum run at C speed
+            # and the rescale multiplies by one precomputed reciprocal.
+            weights = array("d", weights)
+            min_weight = min(weights)
+            assert min_weight >= 0, f"expecting non-negative weights, got {min_weight=}"
             total_weight = sum(weights)
             assert total_weight > 0, "expecting some positive weights, got none"
-            weights = [x / total_weight for x in weights]
+            if abs(total_weight - 1) > 1e-12:
+                scale = 1.0 / total_weight
+                weights = array("d", (x * scale for x in weights))
         assert len(outcomes) == len(
             weights
         ), f"expecting {len(outcomes)=}=={len(weights)=}"
@@ -285,8 +542,16 @@ class FiniteProbabilityDistribution(AbstractFiniteProbabilityDistribution):
                 return False
         return True
 
-    def map(self, f):
-        return type(self).from_duplicated(
+    def map(self, f, cls=None):
+        """
+        distribution of f(x); pass cls to construct the result as
+        another distribution class (say NumericalFiniteProbability-
+        Distribution when f maps labels to numbers) without a pmf_dict
+        round-trip.
+        """
+        if cls is None:
+            cls = type(self)
+        return cls.from_duplicated(
             outcomes=map(f, self.outcomes), weights=self.probabilities
         )
 
@@ -296,9 +561,10 @@ class FiniteProbabilityDistribution(AbstractFiniteProbabilityDistribution):
 
     @classmethod
     def from_duplicated(cls, outcomes, weights):
-        coco = Counter()
+        # defaultdict skips the per-key .get bound-method call in the fold.
+        coco = defaultdict(float)
         for key, value in zip(outcomes, weights):
-            coco.update({key: value})
+            coco[key] += value
         return cls(outcomes=list(coco.keys()), weights=list(coco.values()))
 
     @classmethod
@@ -312,6 +578,14 @@ class NumericalFiniteProbabilityDistribution(
     pass
 
 
+def sum_of(dist, n):
+    """
+    distribution of the sum of n independent draws from dist; spelled
+    dist % n in operator form, which convolves by repeated squaring.
+    """
+    return dist % n
+
+
 def DiceProbabilityDistribution(sides):
     return NumericalFiniteProbabilityDistribution(
         outcomes=list(range(sides)), weights=[1 / sides] * sides
@@ -13,8 +13,12 @@
     Comments: Steven E. Pav
 """
 
+import bisect
 import copy
+import itertools
 import math
+import random
+from collections import defaultdict
 from enum import IntEnum, auto
 
 from dice import FiniteProbabilityDistribution, NumericalFiniteProbabilityDistribution
@@ -38,6 +42,9 @@ class PigState(IntEnum):
 # we add the row and column totals.
 
 BACON_PROB = 23 / 6000
+# integer sentinel for making bacon; keeping the game payoff all-int
+# lets the roll loop compare ints instead of interning strings.
+BACON = -1
 Roll_history = {
     PigState.DOT_UP: [573, 656, 139, 360, 56, 12] + [573, 623, 155, 396, 54, 10],
     PigState.DOT_DOWN: [623, 731, 185, 449, 58, 17] + [656, 731, 180, 473, 67, 10],
@@ -49,8 +56,11 @@ Roll_history = {
 
 # sum([sum(val) for val in Roll_history.values()])
 
+# outcomes are stored as plain ints: sorting and hashing the n*n pair
+# tuples downstream then uses C-level int compares rather than going
+# through IntEnum dunders.  PigState(x) recovers the member for display.
 PigRolls = FiniteProbabilityDistribution.from_duplicated(
-    list(Roll_history.keys()), [sum(x) for x in Roll_history.values()]
+    [int(k) for k in Roll_history.keys()], [sum(x) for x in Roll_history.values()]
 )
 
 # this is from Table 3.
@@ -78,16 +88,69 @@ PayoffTable = {
     (PigState.LEANING_JOWLER, PigState.LEANING_JOWLER): 60,
 }
 
-TwoPigRolls = PigRolls | copy.deepcopy(PigRolls)
-PigPayoff = TwoPigRolls.map(lambda x: PayoffTable.get(x, 0))
-PigPayoff = NumericalFiniteProbabilityDistribution.from_dict(PigPayoff.pmf_dict)
-
-# now a mixed 'dice', which is either 'BACON', or an int value
+# dense symmetric 6x6 payoff grid indexed by PigState value less one; a
+# nested-list lookup replaces a lambda dispatch plus dict.get per pair.
+PAYOFF = [[0] * 6 for _ in range(6)]
+for (a, b), v in PayoffTable.items():
+    PAYOFF[a - 1][b - 1] = v
+    PAYOFF[b - 1][a - 1] = v
+
+# __or__ only reads other's outcomes/probabilities (and does not
+# special-case identity), so there is no need to deep-copy the operand.
+TwoPigRolls = PigRolls | PigRolls
+
+# the payoff pmf folds the 6x6 outer product of the marginal roll
+# weights straight into payoff buckets; no intermediate pair
+# distribution is needed since the grid already resolves each pair.
+_marginal = [sum(x) for x in Roll_history.values()]
+_payoff_pmf = defaultdict(float)
+for i, wi in enumerate(_marginal):
+    for j, wj in enumerate(_marginal):
+        _payoff_pmf[PAYOFF[i][j]] += wi * wj
+PigPayoff = NumericalFiniteProbabilityDistribution.from_dict(_payoff_pmf)
+
+# now a mixed 'dice', which is either BACON (-1), or a payoff value
 GamePayoff = NumericalFiniteProbabilityDistribution(
-    ["BACON"] + PigPayoff.outcomes,
+    [BACON] + PigPayoff.outcomes,
     [BACON_PROB] + [(1 - BACON_PROB) * x for x in PigPayoff.probabilities],
 )
+# shared read-only default for PassThePigsGame; the distribution is
+# immutable, so every game can reuse this one instead of rebuilding it.
+_DEFAULT_GAME_PAYOFF = GamePayoff
+
+# cached summary statistics, exported so strategy code need not re-walk
+# the support to recover them.
+PIG_EXPECTED_VALUE = PigPayoff.expected_value()
+PIG_VARIANCE = PigPayoff.variance()
+GAME_EXPECTED_PAYOFF = sum(k * v for k, v in GamePayoff.pmf_dict.items() if k != BACON)
+
+
+
+class _RollSource:
+    """
+    buffered outcome source: draws rolls a block at a time through
+    random.choices against the cached cumulative weights and hands them
+    out one by one, amortizing the sampler call across the block.
+    """
 
+    def __init__(self, game_payoff=None, block_size=64):
+        if game_payoff is None:
+            game_payoff = _DEFAULT_GAME_PAYOFF
+        self.__outcomes = game_payoff.outcomes
+        self.__cum = game_payoff._cumweights
+        self.__block_size = block_size
+        self.__block = []
+        self.__idx = 0
+
+    def roll(self):
+        idx = self.__idx
+        if idx >= len(self.__block):
+            self.__block = random.choices(
+                self.__outcomes, cum_weights=self.__cum, k=self.__block_size
+            )
+            idx = 0
+        self.__idx = idx + 1
+        return self.__block[idx]
 
 
 class PassThePigsGame:
@@ -95,12 +158,22 @@ class PassThePigsGame:
         self.__n_players = n_players
         self.__scores = [0] * n_players
         if game_payoff is None:
-            game_payoff = NumericalFiniteProbabilityDistribution(
-                ["BACON"] + PigPayoff.outcomes,
-                [BACON_PROB] + [(1 - BACON_PROB) * x for x in PigPayoff.probabilities],
-            )
+            game_payoff = _DEFAULT_GAME_PAYOFF
         self.__winning_score = winning_score
         self.__game_payoff = game_payoff
+        self.__roll_source = _RollSource(game_payoff)
+        self.__turn = turn
+        self.__current_tally = 0
+        self.__game_winner = None
+        self.__turn_history = []
+
+    def reset(self, turn=0):
+        """
+        return the game to its initial state for reuse, keeping the
+        payoff distribution and roll buffer; cheaper than constructing a
+        fresh game per match.
+        """
+        self.__scores = [0] * self.__n_players
         self.__turn = turn
         self.__current_tally = 0
         self.__game_winner = None
@@ -152,8 +225,8 @@ class PassThePigsGame:
 
     def roll(self):
         if self.__game_winner is None:
-            outcome = self.__game_payoff.generate()
-            if outcome == "BACON":
+            outcome = self.__roll_source.roll()
+            if outcome == BACON:
                 self.__current_tally = -self.__scores[self.__turn]
                 self.pass_the_pigs()
                 return -1
@@ -176,6 +249,69 @@ class PassThePigsGame:
         else:
             return 0
 
+def _payoff_arrays(game_payoff=None):
+    """
+    precompute (cum_weights, values) from a game payoff distribution,
+    mapping any legacy 'BACON' outcome to the int sentinel.
+    """
+    if game_payoff is None:
+        game_payoff = GamePayoff
+    values = [BACON if x == "BACON" else x for x in game_payoff.outcomes]
+    cum = list(itertools.accumulate(game_payoff.probabilities))
+    return cum, values
+
+
+def simulate_game(cum_weights, values, hold_tallies, winning_score=100, start_turn=0):
+    """
+    play one game of hold-at-threshold players straight from precomputed
+    payoff arrays, keeping all state in locals rather than going through
+    PassThePigsGame attribute access per roll.  Returns the winning
+    player index.
+    """
+    n_players = len(hold_tallies)
+    scores = [0] * n_players
+    turn = start_turn
+    total = cum_weights[-1]
+    rand = random.random
+    bis = bisect.bisect
+    while True:
+        tally = 0
+        hold = hold_tallies[turn]
+        score = scores[turn]
+        while True:
+            outcome = values[bis(cum_weights, rand() * total)]
+            if outcome == -1:
+                # made bacon; the whole score is forfeit.
+                score = 0
+                tally = 0
+                break
+            if outcome == 0:
+                # pigged out; just the tally is forfeit.
+                tally = 0
+                break
+            tally += outcome
+            if score + tally >= winning_score:
+                return turn
+            if tally >= hold:
+                break
+        scores[turn] = score + tally
+        turn = (turn + 1) % n_players
+
+
+def simulate_games(n_games, hold_tallies, game_payoff=None, winning_score=100):
+    """
+    run many hold-at-threshold games, rotating the starting player;
+    returns win counts per player.
+    """
+    cum, values = _payoff_arrays(game_payoff)
+    n_players = len(hold_tallies)
+    wins = [0] * n_players
+    for i in range(n_games):
+        winner = simulate_game(cum, values, hold_tallies, winning_score, i % n_players)
+        wins[winner] += 1
+    return wins
+
+
 def normal_cdf(x, lower_tail=True):
     retv = 0.5*(1 + math.erf(x / math.sqrt(2)))
     if lower_tail:
@@ -189,20 +325,81 @@ def approximate_chi2_cdf(chi2, df, lower_tail=True):
     Uses the approximation of Luisa Canal (2005)
     """
     adjchi = chi2 / df
-    L = adjchi**(1/6) - (1/2) * adjchi**(1/3) + (1/3)*adjchi**(1/2)
-    mu = 5/6 - (1/(9*df)) - (7/(648*df*df)) + (25/(2187*df*df*df))
-    sigma2 = (1/(18*df)) + (1/(162*df*df)) - (37 / (11664*df*df*df))
+    # one sixth-root, then multiply up: x6^2 = adjchi^(1/3), x6^3 = adjchi^(1/2)
+    x6 = adjchi**(1/6)
+    x3 = x6 * x6
+    L = x6 - (1/2) * x3 + (1/3) * x3 * x6
+    inv_df = 1 / df
+    inv_df2 = inv_df * inv_df
+    inv_df3 = inv_df2 * inv_df
+    mu = 5/6 - inv_df/9 - (7/648)*inv_df2 + (25/2187)*inv_df3
+    sigma2 = inv_df/18 + inv_df2/162 - (37/11664)*inv_df3
     return normal_cdf((L - mu)/math.sqrt(sigma2),lower_tail=lower_tail)
 
 def which_max(a):
-    return max(enumerate(a), key=lambda x: x[1])[0]
+    # index of the first maximum; a.__getitem__ as the key avoids both
+    # the enumerate tuples and a lambda dispatch per element.
+    return max(range(len(a)), key=a.__getitem__)
+
+class _RotatedScores:
+    """
+    read-only rotated view of the score list as seen from one player:
+    view[0] is that player's score, view[1:] the opponents' in turn
+    order.  Replaces the copy-and-reslice pair of list allocations that
+    play() used to make for every pass decision.
+    """
+
+    __slots__ = ("_scores", "_offset", "_nel")
+
+    def __init__(self, scores, offset):
+        self._scores = scores
+        self._offset = offset
+        self._nel = len(scores)
+
+    def __len__(self):
+        return self._nel
+
+    def __getitem__(self, i):
+        nel = self._nel
+        if isinstance(i, slice):
+            scores = self._scores
+            offset = self._offset
+            return [scores[(j + offset) % nel] for j in range(*i.indices(nel))]
+        if i < -nel or i >= nel:
+            raise IndexError(f"index {i} out of range for {nel} players")
+        return self._scores[(i + self._offset) % nel]
+
+    def __iter__(self):
+        scores = self._scores
+        offset = self._offset
+        nel = self._nel
+        for j in range(nel):
+            yield scores[(j + offset) % nel]
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+def _play_chunk(args):
+    """
+    worker for play_parallel: replays a chunk of games in a fresh
+    tournament with its own seeded rng, returning the win counts.
+    """
+    bots, game_payoff, winning_score, reps, start_turn, seed = args
+    random.seed(seed)
+    tourney = PassThePigsTournament(
+        bots, game_payoff=game_payoff, winning_score=winning_score, turn=start_turn
+    )
+    tourney.play(reps)
+    return tourney.win_history
+
 
 class PassThePigsTournament:
-    def __init__(self, bots, game_payoff=None, winning_score=100):
+    def __init__(self, bots, game_payoff=None, winning_score=100, turn=0):
         self.__bots = bots
         self.__game_payoff = game_payoff
         self.__winning_score = winning_score
-        self.__turn = 0
+        self.__turn = turn
         self.__win_history = [0] * len(bots)
 
     @property
@@ -218,56 +415,108 @@ class PassThePigsTournament:
         total = sum(self.__win_history)
         return [x/total for x in self.__win_history]
 
+    def play_parallel(self, reps, n_jobs=None):
+        """
+        split reps games across worker processes and fold the win counts
+        back into win_history.  Bots must be picklable -- module-level
+        functions or functools.partial of them; lambdas will not make
+        the trip.
+        """
+        import multiprocessing
+
+        if n_jobs is None:
+            n_jobs = multiprocessing.cpu_count()
+        n_jobs = max(1, min(n_jobs, reps))
+        counts = [reps // n_jobs + (1 if i < reps % n_jobs else 0) for i in range(n_jobs)]
+        n_players = self.n_players
+        args = [
+            (
+                self.__bots,
+                self.__game_payoff,
+                self.__winning_score,
+                count,
+                i % n_players,
+                random.getrandbits(64),
+            )
+            for i, count in enumerate(counts)
+        ]
+        with multiprocessing.Pool(n_jobs) as pool:
+            for history in pool.map(_play_chunk, args):
+                for i, wins in enumerate(history):
+                    self.__win_history[i] += wins
+
+    def play_tally_limit(self, reps, tally_limits):
+        """
+        fast path for hold-at-threshold bots: runs reps games through
+        simulate_game, which inlines the roll and pass logic in locals,
+        instead of the generic per-roll bot-callback loop in play.
+        tally_limits gives the threshold per player.
+        """
+        assert len(tally_limits) == self.n_players
+        cum, values = _payoff_arrays(self.__game_payoff)
+        winning_score = self.__winning_score
+        n_players = self.n_players
+        for _ in range(reps):
+            winner = simulate_game(
+                cum, values, tally_limits, winning_score, self.__turn
+            )
+            self.__win_history[winner] += 1
+            self.__turn = (self.__turn + 1) % n_players
+
     def play(self, reps):
+        # one game object reused across reps; reset() is much cheaper
+        # than re-running __init__ and its payoff table setup per match.
+        new_game = PassThePigsGame(
+            n_players=self.n_players,
+            turn=self.__turn,
+            game_payoff=self.__game_payoff,
+            winning_score=self.__winning_score,
+        )
         for playnum in range(reps):
-            new_game = PassThePigsGame(
-                n_players=self.n_players,
-                turn=self.__turn,
-                game_payoff=self.__game_payoff,
-                winning_score=self.__winning_score,
-            )
+            new_game.reset(turn=self.__turn)
             while new_game.winner is None:
                 new_game.roll()
                 if new_game.has_tally:
                     pturn = new_game.turn
-                    scores = copy.copy(new_game.scores)
-                    scores = scores[pturn:] + scores[:pturn]
                     do_pass = self.__bots[pturn](
-                        new_game.current_tally, scores, self.__winning_score
+                        new_game.current_tally,
+                        _RotatedScores(new_game.scores, pturn),
+                        self.__winning_score,
                     )
                     if do_pass:
                         new_game.pass_the_pigs()
             self.__win_history[new_game.winner] += 1
             self.__turn = (self.__turn + 1) % len(self.__bots)
 
-    def tournament(self, max_reps=10_000, type_I=0.05, type_II=0.20, min_reps=2_000, rep_interval=500):
+    def tournament(self, max_reps=10_000, type_I=0.05, type_II=0.20, min_reps=2_000, rep_interval=500, margin=0.05):
         """
-        Runs some number of rounds of tournaments, then computes a hypothesis test
-        for a fair coin. If it finds one strategy dominates the others, it squawks and
-        returns. Eventually this will be a proper sequential test.
+        Runs rounds of tournaments under a sequential probability ratio
+        test on the leader against the runner-up: the alternative says
+        the leader takes their head-to-head wins at rate 0.5 + margin,
+        the null says they are even.  Crossing the upper Wald boundary
+        declares the leader early; crossing the lower one gives up on a
+        dominant bot early; otherwise play continues to max_reps.
         """
-        found_winner = False
-        full_reps = False
-        done = False
-        winner = None
-        while not (found_winner or full_reps):
+        upper = math.log((1 - type_II) / type_I)
+        lower = math.log(type_II / (1 - type_I))
+        log_win = math.log((0.5 + margin) / 0.5)
+        log_lose = math.log((0.5 - margin) / 0.5)
+        while True:
             self.play(rep_interval)
             observed = self.win_history
             reps = sum(observed)
-            expected = [reps/self.n_players] * self.n_players
-            # this is twice the negative log likelihood ratio under fair coin.
-            G2 = 2 * sum([obs * math.log(obs/expy) for obs,expy in zip(observed, expected)])
-            pvalue = approximate_chi2_cdf(G2, self.n_players, lower_tail=False)
-            found_winner = (pvalue <= type_I) and (reps >= min_reps)
+            first, second = sorted(observed, reverse=True)[:2]
+            llr = first * log_win + second * log_lose
             winner = which_max(observed)
-            full_reps = reps >= max_reps
-        if found_winner:
-            print(f"{winner} is a winner after {reps} reps. {pvalue=}")
-        elif full_reps:
-            print(f"no clear winner found after {reps} reps.")
-        else:
-            print("your code is broken")
-        return winner
+            if reps >= min_reps and llr >= upper:
+                print(f"{winner} is a winner after {reps} reps. {llr=:.2f}")
+                return winner
+            if reps >= min_reps and llr <= lower:
+                print(f"no dominant bot after {reps} reps. {llr=:.2f}")
+                return winner
+            if reps >= max_reps:
+                print(f"no clear winner found after {reps} reps.")
+                return winner
 
 
 
@@ -313,14 +562,14 @@ def run_three(n_matches=10_000):
 # need a sorted product for ordered distributions...
 def test_pigroll():
     # TwoPigRolls = PigRolls % copy.deepcopy(PigRolls)
-    TwoPigRolls = PigRolls | copy.deepcopy(PigRolls)
+    TwoPigRolls = PigRolls | PigRolls
     TwoPigRolls.generate()
     TwoPigRolls.pmf_dict
 
 
 def test_pig_payoff():
-    ep = pigpayoff.expected_value()
-    vp = pigpayoff.variance()
+    ep = PigPayoff.expected_value()
+    vp = PigPayoff.variance()
 
 
 def test_pig_game():
@@ -15,25 +15,20 @@
 
 import pig
 import functools
-from collections import defaultdict
 
 def strategy_tally_limit(tally, scores, winscore, tally_limit=20):
     return tally >= tally_limit
 
-exp_payoff = pig.PigPayoff.expected_value() 
-prob_pigout = pig.PigPayoff.pmf(0) 
-
-def strategy_expected_value_limit(tally, scores, winscore, bacon_prob=None, exp_payoff=None, prob_pigout=None):
-    if bacon_prob is None:
-        bacon_prob = pig.GamePayoff.pmf('BACON') 
-    if prob_pigout is None:
-        prob_pigout = pig.GamePayoff.pmf(0)
-    if exp_payoff is None:
-        pd = pig.GamePayoff.pmf_dict
-        exp_payoff = 0
-        for k, v in pd.items():
-            if isinstance(k, (int,float)):
-                exp_payoff += k*v
+exp_payoff = pig.PIG_EXPECTED_VALUE
+prob_pigout = pig.PigPayoff.pmf(0)
+
+# bind the game-payoff constants once at import; recomputing them per
+# decision walked the whole pmf_dict on every tally.
+_BACON_PROB = pig.GamePayoff.pmf(pig.BACON)
+_PROB_PIGOUT = pig.GamePayoff.pmf(0)
+_EXP_PAYOFF = pig.GAME_EXPECTED_PAYOFF
+
+def strategy_expected_value_limit(tally, scores, winscore, bacon_prob=_BACON_PROB, exp_payoff=_EXP_PAYOFF, prob_pigout=_PROB_PIGOUT):
     # the expected value from another roll is
     exp_another_roll = exp_payoff - tally * (prob_pigout) - (tally + scores[0]) * bacon_prob
     return exp_another_roll <= 0
@@ -71,56 +66,93 @@ def example_tournament_2(max_reps=10_000):
     winner = tourney.tournament(max_reps=max_reps)
     return tourney
 
-tourney = example_tournament_2(40_000)
-tourney.win_history
-
-# winprobs is a dict with keys as tuples:
-# (myscore, theirscore, mytally) and points to (probwin, best_action)
-# we prepopulate it with approximate winprobs.
-winprobs = defaultdict(lambda : (0.5, None))  # not sure this is necessary
+class WinProbTable:
+    """
+    dense (winscore+1)^3 win-probability and action tables, prepopulated
+    with the approximate win probabilities.  Indexing with a
+    (myscore, theirscore, tally) tuple returns (probwin, best_action),
+    preserving the dict interface strategy_optimal consumes, while the
+    DP sweep reaches into the nested lists directly.
+    """
+
+    def __init__(self, winscore=100):
+        self.winscore = winscore
+        nel = winscore + 1
+        self.probs = []
+        self.actions = []
+        for myscore in range(nel):
+            prob_plane = []
+            act_plane = []
+            for theirscore in range(nel):
+                prow = [0.5] * nel
+                if theirscore < winscore:
+                    for tally in range(winscore - myscore):
+                        probwin = 0.03 + (0.5 * (1 + ((myscore + tally) - theirscore) / winscore))
+                        probwin += 0.3 * (myscore+tally)/winscore
+                        prow[tally] = max(0, min(1, probwin))
+                prob_plane.append(prow)
+                act_plane.append([None] * nel)
+            self.probs.append(prob_plane)
+            self.actions.append(act_plane)
+
+    def __getitem__(self, key):
+        myscore, theirscore, tally = key
+        return (
+            self.probs[myscore][theirscore][tally],
+            self.actions[myscore][theirscore][tally],
+        )
+
+# winprobs maps (myscore, theirscore, mytally) to (probwin, best_action).
 winscore = 100
-for myscore in range(winscore):
-    for theirscore in range(winscore):
-        for tally in range(winscore-myscore):
-            probwin = 0.03 + (0.5 * (1 + ((myscore + tally) - theirscore) / winscore))
-            probwin += 0.3 * (myscore+tally)/winscore
-            probwin = max(0,min(1,probwin))
-            winprobs[(myscore, theirscore, tally)] = (probwin, None)
+winprobs = WinProbTable(winscore)
 
 def do_dp_updates(winprobs, other_probs=None, min_change=0.002, max_it=100, sentinel_keys=[(0,0,0), (30,30,0), (91,91,1)]):
     if other_probs is None:
-        other_probs = pig.GamePayoff.pmf_dict
-    bacon_prob = other_probs['BACON']
-    zero_prob = other_probs[0]
-    del other_probs['BACON']
-    del other_probs[0]
+        # copy before popping the sentinels out; deleting from the
+        # distribution's cached pmf_dict would corrupt it for everyone.
+        other_probs = dict(pig.GamePayoff.pmf_dict)
+    else:
+        other_probs = dict(other_probs)
+    bacon_prob = other_probs.pop(pig.BACON)
+    zero_prob = other_probs.pop(0)
+    point_probs = list(other_probs.items())
+    probs = winprobs.probs
+    actions = winprobs.actions
+    ws = winprobs.winscore
+    sentinel_keys = [key for key in sentinel_keys if max(key) <= ws]
     sentinel = {key:winprobs[key][0] for key in sentinel_keys}
     iterates = 0
     done_iterates = iterates >= max_it
     converged = False
     while not done_iterates and not converged:
-        for myscore in range(winscore,-1,-1):
-            for theirscore in range(winscore,-1,-1):
-                for tally in range(winscore-myscore,-1,-1):
-                    pass_lose_prob, _ = winprobs[(theirscore, myscore+tally, 0)]
-                    pass_win_prob = 1 - pass_lose_prob
+        for myscore in range(ws,-1,-1):
+            my_probs = probs[myscore]
+            my_actions = actions[myscore]
+            for theirscore in range(ws,-1,-1):
+                # all the opponent-response reads index this plane.
+                their_plane = probs[theirscore]
+                prow = my_probs[theirscore]
+                arow = my_actions[theirscore]
+                # bacon and pigout terms do not depend on the tally.
+                roll_win_base = bacon_prob * (1 - their_plane[0][0])
+                roll_win_base += zero_prob * (1 - their_plane[myscore][0])
+                for tally in range(ws-myscore,-1,-1):
+                    pass_win_prob = 1 - their_plane[myscore+tally][0]
                     # now the probability of winning when you roll again.
-                    roll_win_prob = 0
-                    bacon_lose_prob, _ = winprobs[(theirscore, 0, 0)] 
-                    roll_win_prob += bacon_prob * (1 - bacon_lose_prob)
-                    pigout_lose_prob, _ = winprobs[(theirscore, myscore, 0)] 
-                    roll_win_prob += zero_prob * (1 - pigout_lose_prob)
-                    for points, prob in other_probs.items():
-                        if myscore + tally + points >= winscore:
-                            this_win_prob = 1
+                    roll_win_prob = roll_win_base
+                    needed = ws - myscore - tally
+                    for points, prob in point_probs:
+                        if points >= needed:
+                            roll_win_prob += prob
                         else:
-                            this_win_prob, _ = winprobs[(myscore, theirscore, tally + points)] 
-                        roll_win_prob += prob * this_win_prob
+                            roll_win_prob += prob * prow[tally + points]
                     # we now have the pass_win_prob and the roll_win_prob; use these.
                     if pass_win_prob > roll_win_prob:
-                        winprobs[(myscore, theirscore, tally)] = (pass_win_prob, 'pass')
+                        prow[tally] = pass_win_prob
+                        arow[tally] = 'pass'
                     else:
-                        winprobs[(myscore, theirscore, tally)] = (roll_win_prob, 'roll')
+                        prow[tally] = roll_win_prob
+                        arow[tally] = 'roll'
         iterates += 1
         done_iterates = iterates >= max_it
         next_sentinel = {key:winprobs[key][0] for key in sentinel_keys}
@@ -129,18 +161,10 @@ def do_dp_updates(winprobs, other_probs=None, min_change=0.002, max_it=100, sent
         sentinel = next_sentinel
     return winprobs
 
-winprobs = do_dp_updates(winprobs, min_change=0.0001, max_it=100)
-
-for k,v in winprobs.items():
-    if v[1] is None:
-        print(f"missing for {k}")
-        break
-
 def strategy_optimal(tally, scores, winscore, winprobs):
-    myscore = scores[0]
-    theirscore = max(scores[1:])
-    _, strat = winprobs[(myscore, theirscore, tally)]
-    return strat == "pass"
+    # index the dense action table directly rather than building a
+    # tuple key and going through WinProbTable.__getitem__ per decision.
+    return winprobs.actions[scores[0]][max(scores[1:])][tally] == "pass"
 
 def example_tournament_3(max_reps=10_000):
     tourney = pig.PassThePigsTournament(
@@ -154,8 +178,21 @@ def example_tournament_3(max_reps=10_000):
     winner = tourney.tournament(max_reps=max_reps, min_reps=0.5 * max_reps)
     return tourney
 
-tourney = example_tournament_3(50_000)
-tourney.win_history
+
+if __name__ == "__main__":
+    tourney = example_tournament_2(40_000)
+    print(tourney.win_history)
+
+    winprobs = do_dp_updates(winprobs, min_change=0.0001, max_it=100)
+    for myscore in range(winscore):
+        for theirscore in range(winscore):
+            for tally in range(winscore - myscore):
+                if winprobs.actions[myscore][theirscore][tally] is None:
+                    print(f"missing for {(myscore, theirscore, tally)}")
+                    break
+
+    tourney = example_tournament_3(50_000)
+    print(tourney.win_history)
 
 
 #for vim modeline: (do not edit)
@@ -27,7 +27,6 @@ where p1 is the unconditional probability of wining outright from a given positi
 p2 is the unconditional probability of a tie.
 """
 
-from copy import copy
 from functools import cached_property
 # this is in 3.9, I'm afraid:
 # from functools import cache
@@ -36,6 +35,8 @@ cache = lru_cache(maxsize=None)
 
 from urn import Urn
 from collections import Counter
+import itertools
+from math import factorial, perm
 
 from enum import Enum, IntEnum, auto
 from functools import total_ordering
@@ -79,12 +80,34 @@ weird_deck = Urn(Counter({50:2, 32:12, 10:12, 7: 12, 4:12}))
 
 
 class PutRules():
+    # slot descriptors make the per-call self.__joker_mask and
+    # self.__deck loads C-level indexed reads instead of dict probes.
+    __slots__ = ('__deck', '__joker_func', '__joker_mask')
     def __init__(self, deck, joker_func):
         self.__deck = deck
         self.__joker_func = joker_func
+        # tabulate the joker test over the deck once: score_from used to
+        # call the joker lambda six times per invocation, and ranks are
+        # small non-negative ints so one bitmask covers the deck.
+        joker_mask = 0
+        for rank in deck.keys():
+            if joker_func(rank):
+                joker_mask |= 1 << int(rank)
+        self.__joker_mask = joker_mask
     @property
     def deck(self):
-        return copy(self.__deck)
+        """
+        the deck urn itself; treat it as read-only.  sampling already
+        copies internally, and the strategy builders only enumerate it.
+        """
+        return self.__deck
+    @property
+    def _joker_mask(self):
+        """
+        bitmask over ranks accepted by the joker test; enumeration
+        kernels fold it into score table lookups directly.
+        """
+        return self.__joker_mask
     @staticmethod
     def score_trick(play1, play2):
         """
@@ -104,58 +127,148 @@ class PutRules():
         In the case of a joker played, the side that played a joker will only win on
         2 wins and a tie or 2 wins and a loss.
         """
-        stricks = sorted([trick1, trick2, trick3])
+        # the whole input domain is three trick scores in {-1, 0, 1} and
+        # two flags, so every answer is tabulated once at import and this
+        # is a single branch-free table load.
+        return PutRules._SCORE_LUT[trick1 + 1][trick2 + 1][trick3 + 1][(2 if joker_1 else 0) + (1 if joker_2 else 0)]
+    @staticmethod
+    def _compute_score_match(trick1, trick2, trick3, joker_1=False, joker_2=False):
+        """
+        the branchy computation behind score_match, kept to fill the
+        lookup table.
+        """
+        # order the three scores with compare-and-swaps; sorted() builds
+        # a list per call and this runs in every enumeration kernel.
+        lo, mid, hi = trick1, trick2, trick3
+        if lo > mid:
+            lo, mid = mid, lo
+        if mid > hi:
+            mid, hi = hi, mid
+            if lo > mid:
+                lo, mid = mid, lo
         if joker_1 and joker_2:
             # no possibility of a 3 win condition if both played jokers:
             # either they played simultaneously and so there is a tie,
             # or each player won 1 trick with their joker.
-            if stricks[0] <= 0 and stricks[1] > 0:
+            if lo <= 0 and mid > 0:
                 return 1
-            elif stricks[1] < 0 and stricks[2] >= 0:
+            elif mid < 0 and hi >= 0:
                 return -1
             else:
                 return 0
         elif joker_1:
-            if stricks[0] > 0:
+            if lo > 0:
                 # won all three and thus lost
                 return -1
-            elif stricks[0] <= 0 and stricks[1] > 0:
+            elif lo <= 0 and mid > 0:
                 return 1
-            elif stricks[1] < 0:
+            elif mid < 0:
                 return -1
             else:
                 return 0
         elif joker_2:
-            if stricks[2] < 0:
+            if hi < 0:
                 # won all three and thus lost
                 return 1
-            elif stricks[2] >= 0 and stricks[1] < 0:
+            elif hi >= 0 and mid < 0:
                 return -1
-            elif stricks[1] > 0:
+            elif mid > 0:
                 return 1
             else:
                 return 0
         else:
-            if stricks[1] > 0:
+            if mid > 0:
                 return 1
-            elif stricks[1] < 0:
+            elif mid < 0:
                 return -1
             else:
                 return 0
+    @cache
+    def _score_from_ints(self, c11, c12, c21, c22, c31, c32):
+        """
+        flat-argument memoized form of score_from; the distinct card
+        patterns number at most nranks^6, so after the enumeration
+        kernels warm the cache most calls are one dict probe.
+        """
+        mask = self.__joker_mask
+        joker_1 = (mask >> c11 | mask >> c21 | mask >> c31) & 1
+        joker_2 = (mask >> c12 | mask >> c22 | mask >> c32) & 1
+        trick1 = self.score_trick(c11, c12)
+        trick2 = self.score_trick(c21, c22)
+        trick3 = self.score_trick(c31, c32)
+        return self.score_match(trick1, trick2, trick3, joker_1=joker_1, joker_2=joker_2)
     def score_from(self, pair1, pair2, pair3):
         """
         determine if jokers were played, score each trick and return the match score
         """
-        joker_1 = self.__joker_func(pair1[0]) or self.__joker_func(pair2[0]) or self.__joker_func(pair3[0])
-        joker_2 = self.__joker_func(pair1[1]) or self.__joker_func(pair2[1]) or self.__joker_func(pair3[1])
-        trick1 = self.score_trick(pair1[0], pair1[1])
-        trick2 = self.score_trick(pair2[0], pair2[1])
-        trick3 = self.score_trick(pair3[0], pair3[1])
-        return self.score_match(trick1, trick2, trick3, joker_1=joker_1, joker_2=joker_2)
+        return self._score_from_ints(pair1[0], pair1[1], pair2[0], pair2[1], pair3[0], pair3[1])
+
+PutRules._SCORE_LUT = [[[[PutRules._compute_score_match(t1, t2, t3, j >= 2, j % 2 == 1) for j in range(4)]
+                         for t3 in (-1, 0, 1)]
+                        for t2 in (-1, 0, 1)]
+                       for t1 in (-1, 0, 1)]
+
+def _nested_table(nranks, depth):
+    if depth <= 1:
+        return [None] * nranks
+    return [_nested_table(nranks, depth - 1) for _ in range(nranks)]
+
+
+class _DenseTable:
+    """
+    value table over fixed-length tuples of small integer ranks, stored
+    as nested lists with None marking absent entries.  keeps enough of
+    the dict interface (get, items, iteration over keys) for the csv
+    sinks and cold consumers, while the enumeration kernels index .data
+    directly, skipping a tuple allocation and hash probe per lookup.
+    requires card values usable as list indices, i.e. small non-negative
+    integers; IntEnum members qualify.
+    """
+    def __init__(self, nranks, depth):
+        self.nranks = nranks
+        self.depth = depth
+        self.data = _nested_table(nranks, depth)
+
+    def __getitem__(self, key):
+        cell = self.data
+        for idx in key:
+            cell = cell[idx]
+        if cell is None:
+            raise KeyError(key)
+        return cell
+
+    def get(self, key, default=None):
+        cell = self.data
+        for idx in key:
+            cell = cell[idx]
+        return default if cell is None else cell
+
+    def __setitem__(self, key, value):
+        cell = self.data
+        for idx in key[:-1]:
+            cell = cell[idx]
+        cell[key[-1]] = value
+
+    def items(self):
+        def _rec(cell, key, remaining):
+            if remaining == 0:
+                if cell is not None:
+                    yield (key, cell)
+            else:
+                for idx, sub in enumerate(cell):
+                    yield from _rec(sub, key + (idx,), remaining - 1)
+        yield from _rec(self.data, (), self.depth)
+
+    def keys(self):
+        for key, _ in self.items():
+            yield key
+
+    def __iter__(self):
+        return self.keys()
+
+    def __len__(self):
+        return sum(1 for _ in self.items())
 
-short_deck = Urn(Counter({k:4 for k in range(5)}))
-pr = PutRules(deck=short_deck, joker_func=lambda x:x==4)
-pr.score_from((2, 0), (1, 0), (0, 0))
 
 class PutOptimalStrategy():
     """
@@ -201,15 +314,100 @@ class PutOptimalStrategy():
     """
     def __init__(self, rules):
         self.__rules = rules
+    @cached_property
+    def _nranks(self):
+        return max(int(k) for k in self.__rules.deck.keys()) + 1
+    @cache
+    def _perm_list(self, k):
+        """
+        materialized deck.perm_k(k) rows, shared by every stage that
+        enumerates the same k.  each stage used to re-run the generator,
+        re-copying the urn once per row.
+        """
+        return list(self.__rules.deck.perm_k(k=k))
+    @cache
+    def _tail_items(self, k):
+        """
+        per row of _perm_list(k), the tail urn's positive (rank, count)
+        pairs as a tuple.  the tail composition does not depend on
+        pw_tup, so kernels that rebuild per pw_tup reuse these instead
+        of re-walking the tail urn every pass.
+        """
+        return [tuple((rank, cnt) for rank, cnt in row[-1].items() if cnt > 0)
+                for row in self._perm_list(k)]
+    @cache
+    def _tail_pairs(self, k):
+        """
+        per row of _perm_list(k), the two-card draws from the tail urn
+        as (high, low, probability) tuples.  both orderings of a
+        distinct pair play out identically downstream (the second-trick
+        lookups key on the sorted pair), so they fold into one weight,
+        halving the inner iterations.
+        """
+        retv = []
+        for row in self._perm_list(k):
+            tail_urn = row[-1]
+            total = sum(cnt for _, cnt in tail_urn.items())
+            deno = total * (total - 1)
+            ranks_desc = sorted((r for r, v in tail_urn.items() if v > 0), reverse=True)
+            rows = []
+            for hi, lo in itertools.combinations_with_replacement(ranks_desc, 2):
+                if hi == lo:
+                    wt = tail_urn[hi] * (tail_urn[hi] - 1)
+                else:
+                    wt = 2 * tail_urn[hi] * tail_urn[lo]
+                if wt > 0:
+                    rows.append((hi, lo, wt / deno))
+            retv.append(tuple(rows))
+        return retv
+    @cache
+    def _tail_triples(self, k):
+        """
+        per row of _perm_list(k), the descending three-card multisets
+        drawable from the tail urn, with the count of ordered draws as
+        an integer weight.  shared by the first-trick kernels, which
+        used to redo this enumeration on every pw_tup rebuild.
+        """
+        retv = []
+        for row in self._perm_list(k):
+            tail_urn = row[-1]
+            ranks_desc = sorted((r for r, v in tail_urn.items() if v > 0), reverse=True)
+            rows = []
+            for sord in itertools.combinations_with_replacement(ranks_desc, 3):
+                wt = 6
+                for v, mult in Counter(sord).items():
+                    wt = wt * perm(tail_urn[v], mult) // factorial(mult)
+                if wt > 0:
+                    rows.append((sord, wt))
+            retv.append(tuple(rows))
+        return retv
+    @cached_property
+    def _ranks_desc(self):
+        """
+        the distinct ranks of the deck in descending order, for the
+        decision builders that enumerate canonical sorted hands directly.
+        """
+        return sorted((k for k, v in self.__rules.deck.items() if v > 0), reverse=True)
+    @staticmethod
+    def _put_best2(tup1, tup2):
+        """
+        Given two tuples of the form (card, valuation1, valuation2, ...),
+        returns the 'maximal' tuple: the one with the larger valuation1,
+        breaking ties towards the smaller card value.
+        """
+        if tup1[1] > tup2[1] or (tup1[1] == tup2[1] and tup1[0] < tup2[0]):
+            return tup1
+        return tup2
     @staticmethod
-    def _put_best(alist):
+    def _put_best3(tup1, tup2, tup3):
         """
-        Given a list consisting of tuples of the form (card, valuation1, valuation2, ...),
-        returns the 'maximal' tuple of the list, where the sort is in 
-        ascending order of valuation1, but descending card value.
+        three-way version of _put_best2.
         """
-        # we cannot negate cards but we can negate values
-        return min(alist, key=lambda x: (-x[1], x[0]))
+        if tup2[1] > tup1[1] or (tup2[1] == tup1[1] and tup2[0] < tup1[0]):
+            tup1 = tup2
+        if tup3[1] > tup1[1] or (tup3[1] == tup1[1] and tup3[0] < tup1[0]):
+            tup1 = tup3
+        return tup1
     @staticmethod
     def _get_wts(pw_tup):
         prob_win_con_win, prob_win_con_tie, prob_win_con_lose = pw_tup
@@ -217,6 +415,15 @@ class PutOptimalStrategy():
         wt_lose = prob_win_con_lose - prob_win_con_tie
         return (wt_win, wt_lose, prob_win_con_tie)
     @staticmethod
+    def _quantize_pw(pw_tup):
+        """
+        round the conditionals to twelve places so that solver noise
+        below the convergence tolerance maps to one memo key; the
+        cached stage builders otherwise rebuild every table for float
+        triples that differ only in the last couple of bits.
+        """
+        return tuple(round(x, 12) for x in pw_tup)
+    @staticmethod
     def _opponent_tup(pw_tup):
         prob_win_con_win, prob_win_con_tie, prob_win_con_lose = pw_tup
         return (1-prob_win_con_lose, 1-prob_win_con_tie, 1-prob_win_con_win)
@@ -232,6 +439,43 @@ class PutOptimalStrategy():
     def can_call_put(pw_tup):
         prob_win_con_win, _, prob_win_con_lose = pw_tup
         return prob_win_con_win < 1
+    @cached_property
+    def _secf_raw(self):
+        """
+        the (pr_win, pr_lose) deal-outcome components of the
+        second-trick follower value.  the remaining play is forced once
+        these five cards are down, so the components do not depend on
+        pw_tup; they enumerate once per strategy object and every
+        second_trick_follower_value build (my view and the opponent's)
+        is an affine re-weighting of these entries.
+        """
+        raw = _DenseTable(self._nranks, 5)
+        raw_d = raw.data
+        score_lut = PutRules._SCORE_LUT
+        mask = self.__rules._joker_mask
+        for (myun1, mypl1, mypl2, thpl1, thpl2, ignore_wt, tail_urn), tail_items \
+                in zip(self._perm_list(5), self._tail_items(5)):
+            # the first two tricks and my joker flag are settled for the
+            # whole tail, so resolve them to a score_match sub-plane once;
+            # each tail card then costs one sign and two list indexes.
+            t1 = 1 if mypl1 > thpl1 else (-1 if mypl1 < thpl1 else 0)
+            t2 = 1 if mypl2 > thpl2 else (-1 if mypl2 < thpl2 else 0)
+            plane = score_lut[t1 + 1][t2 + 1]
+            jbase = ((((mask >> mypl1) | (mask >> mypl2) | (mask >> myun1)) & 1) << 1) \
+                    | (((mask >> thpl1) | (mask >> thpl2)) & 1)
+            numr_win = 0
+            numr_los = 0
+            deno = 0
+            # iterate the tail counts directly; perm_k(k=1) would copy the
+            # urn per tail card, and the raw counts normalize via deno anyway.
+            for thun1, wt in tail_items:
+                t3 = 1 if myun1 > thun1 else (-1 if myun1 < thun1 else 0)
+                outcome = plane[t3 + 1][jbase | ((mask >> thun1) & 1)]
+                numr_win += wt * max(outcome, 0)
+                numr_los -= wt * min(outcome, 0)
+                deno += wt
+            raw_d[myun1][mypl1][mypl2][thpl1][thpl2] = (numr_win / deno, numr_los / deno)
+        return raw
     @cache
     def second_trick_follower_value(self, pw_tup):
         """
@@ -241,21 +485,13 @@ class PutOptimalStrategy():
 
         we add in the prob_win_con_tie so that these are probabilities of ultimately prevailing, and should be between 0 and 1.
         """
-        secf = {}
-        deck = self.__rules.deck
+        raw_d = self._secf_raw.data
+        secf = _DenseTable(self._nranks, 5)
+        secf_d = secf.data
         wt_win, wt_lose, prob_win_con_tie = self._get_wts(pw_tup)
-        for myun1, mypl1, mypl2, thpl1, thpl2, ignore_wt, tail_urn in deck.perm_k(k=5):
-            numr_win = 0
-            numr_los = 0
-            deno = 0
-            for thun1, wt, _ in tail_urn.perm_k(k=1):
-                outcome = self.__rules.score_from((mypl1, thpl1), (mypl2, thpl2), (myun1, thun1))
-                numr_win += wt * max(outcome, 0)
-                numr_los -= wt * min(outcome, 0)
-                deno += wt
-            pr_win = numr_win / deno
-            pr_los = numr_los / deno
-            secf[(myun1, mypl1, mypl2, thpl1, thpl2)] = (prob_win_con_tie + (wt_win * pr_win + wt_lose * pr_los), pr_win, pr_los)
+        for myun1, mypl1, mypl2, thpl1, thpl2, ignore_wt, tail_urn in self._perm_list(5):
+            pr_win, pr_los = raw_d[myun1][mypl1][mypl2][thpl1][thpl2]
+            secf_d[myun1][mypl1][mypl2][thpl1][thpl2] = (prob_win_con_tie + (wt_win * pr_win + wt_lose * pr_los), pr_win, pr_los)
         return secf
     @cache
     def second_trick_follower_decision(self, pw_tup):
@@ -265,17 +501,34 @@ class PutOptimalStrategy():
         by convention unplayed1 >= unplayed2
         the expected value is _conditional_ on those cards having been played.
         """
-        secf = self.second_trick_follower_value(pw_tup=pw_tup)
-        secfd = {}
-        deck = self.__rules.deck
-        for myun1, myun2, mypl1, thpl1, thpl2, ignore_wt, tail_urn in deck.perm_k(k=5):
-            if myun1 < myun2:
-                continue
-            val1 = secf.get((myun2, mypl1, myun1, thpl1, thpl2), None)
-            if val1 is None:
-                continue
-            val2 = secf.get((myun1, mypl1, myun2, thpl1, thpl2))
-            secfd[(myun1, myun2, mypl1, thpl1, thpl2)] = self._put_best([(myun1, *val1), (myun2, *val2)])
+        # read the pw-independent raw components and apply the weights
+        # per candidate, rather than materializing the whole per-pw_tup
+        # secf table just to probe two entries per key here.
+        raw_d = self._secf_raw.data
+        wt_win, wt_lose, prob_win_con_tie = self._get_wts(pw_tup)
+        secfd = _DenseTable(self._nranks, 5)
+        secfd_d = secfd.data
+        # parallel cards-only table: the value stages need just the
+        # chosen card, so let them read a bare int.
+        secfd.cards = _nested_table(self._nranks, 5)
+        secfd_c = secfd.cards
+        ranks = self._ranks_desc
+        put_best2 = self._put_best2
+        # enumerate only the canonical myun1 >= myun2 keys directly; the
+        # value lookup weeds out undrawable hands.
+        for myun1, myun2 in itertools.combinations_with_replacement(ranks, 2):
+            for mypl1, thpl1, thpl2 in itertools.product(ranks, repeat=3):
+                raw1 = raw_d[myun2][mypl1][myun1][thpl1][thpl2]
+                if raw1 is None:
+                    continue
+                pw1, pl1 = raw1
+                pw2, pl2 = raw_d[myun1][mypl1][myun2][thpl1][thpl2]
+                best = put_best2(
+                    (myun1, prob_win_con_tie + (wt_win * pw1 + wt_lose * pl1), pw1, pl1),
+                    (myun2, prob_win_con_tie + (wt_win * pw2 + wt_lose * pl2), pw2, pl2),
+                )
+                secfd_d[myun1][myun2][mypl1][thpl1][thpl2] = best
+                secfd_c[myun1][myun2][mypl1][thpl1][thpl2] = best[0]
         return secfd
     @cache
     def second_trick_leader_value(self, pw_tup):
@@ -287,29 +540,29 @@ class PutOptimalStrategy():
         playing the optimal follow decision.
         By assumption since I am leading in the second trick, myplayed1 >= theirplayed1.
         """
-        secfd = self.second_trick_follower_decision(pw_tup=self._opponent_tup(pw_tup))
+        secfd_c = self.second_trick_follower_decision(pw_tup=self._opponent_tup(pw_tup)).cards
         wt_win, wt_lose, prob_win_con_tie = self._get_wts(pw_tup)
-        secl = {}
-        deck = self.__rules.deck
-        for myun1, mypl1, mypl2, thpl1, ignore_wt, tail_urn in deck.perm_k(k=4):
+        secl = _DenseTable(self._nranks, 4)
+        secl_d = secl.data
+        score_from = self.__rules._score_from_ints
+        for (myun1, mypl1, mypl2, thpl1, ignore_wt, tail_urn), tail_pairs \
+                in zip(self._perm_list(4), self._tail_pairs(4)):
             if mypl1 < thpl1:
                 continue
             numr_win = 0
             numr_los = 0
             deno = 0
-            for thun1, thun2, wt, _ in tail_urn.perm_k(k=2):
-                if wt <= 0:
-                    continue
-                # figure out what they follow with:
-                thpl2, _, _, _ = secfd[(max(thun1, thun2), min(thun1, thun2), thpl1, mypl1, mypl2)]
+            for thun1, thun2, wt in tail_pairs:
+                # thun1 >= thun2; figure out what they follow with:
+                thpl2 = secfd_c[thun1][thun2][thpl1][mypl1][mypl2]
                 thpl3 = thun2 if thpl2==thun1 else thun1
-                outcome = self.__rules.score_from((mypl1, thpl1), (mypl2, thpl2), (myun1, thpl3))
+                outcome = score_from(mypl1, thpl1, mypl2, thpl2, myun1, thpl3)
                 numr_win += wt * max(outcome, 0)
                 numr_los -= wt * min(outcome, 0)
                 deno += wt
             pr_win = numr_win / deno
             pr_los = numr_los / deno
-            secl[(myun1, mypl1, mypl2, thpl1)] = (prob_win_con_tie + (wt_win * pr_win + wt_lose * pr_los), pr_win, pr_los)
+            secl_d[myun1][mypl1][mypl2][thpl1] = (prob_win_con_tie + (wt_win * pr_win + wt_lose * pr_los), pr_win, pr_los)
         return secl
     @cache
     def second_trick_leader_decision(self, pw_tup):
@@ -321,19 +574,22 @@ class PutOptimalStrategy():
         By assumption since I am leading in the second trick, myplayed1 >= theirplayed1.
         We also assume unplayed1 >= unplayed2
         """
-        secl = self.second_trick_leader_value(pw_tup=pw_tup)
-        secld = {}
-        deck = self.__rules.deck
-        for myun1, myun2, mypl1, thpl1, _, _ in deck.perm_k(k=4):
-            if myun1 < myun2:
-                continue
-            if mypl1 < thpl1:
-                continue
-            val1 = secl.get((myun2, mypl1, myun1, thpl1), None)
-            if val1 is None:
-                continue
-            val2 = secl.get((myun1, mypl1, myun2, thpl1))
-            secld[(myun1, myun2, mypl1, thpl1)] = self._put_best([(myun1, *val1), (myun2, *val2)])
+        secl_d = self.second_trick_leader_value(pw_tup=pw_tup).data
+        secld = _DenseTable(self._nranks, 4)
+        secld_d = secld.data
+        secld.cards = _nested_table(self._nranks, 4)
+        secld_c = secld.cards
+        ranks = self._ranks_desc
+        put_best2 = self._put_best2
+        for myun1, myun2 in itertools.combinations_with_replacement(ranks, 2):
+            for mypl1, thpl1 in itertools.combinations_with_replacement(ranks, 2):
+                val1 = secl_d[myun2][mypl1][myun1][thpl1]
+                if val1 is None:
+                    continue
+                val2 = secl_d[myun1][mypl1][myun2][thpl1]
+                best = put_best2((myun1, *val1), (myun2, *val2))
+                secld_d[myun1][myun2][mypl1][thpl1] = best
+                secld_c[myun1][myun2][mypl1][thpl1] = best[0]
         return secld
     @cache
     def first_trick_follower_value(self, pw_tup):
@@ -344,46 +600,67 @@ class PutOptimalStrategy():
         decisions.
         By assumption unplayed1 >= unplayed2
         """
-        secld = self.second_trick_leader_decision(pw_tup=pw_tup)
-        secfd = self.second_trick_follower_decision(pw_tup=pw_tup)
+        secld_c = self.second_trick_leader_decision(pw_tup=pw_tup).cards
+        secfd_c = self.second_trick_follower_decision(pw_tup=pw_tup).cards
         # from your opponent's POV:
-        alt_secld = self.second_trick_leader_decision(pw_tup=self._opponent_tup(pw_tup))
-        alt_secfd = self.second_trick_follower_decision(pw_tup=self._opponent_tup(pw_tup))
+        alt_secld_c = self.second_trick_leader_decision(pw_tup=self._opponent_tup(pw_tup)).cards
+        alt_secfd_c = self.second_trick_follower_decision(pw_tup=self._opponent_tup(pw_tup)).cards
         wt_win, wt_lose, prob_win_con_tie = self._get_wts(pw_tup)
-        firf = {}
-        deck = self.__rules.deck
-        for myun1, myun2, mypl1, thpl1, ignore_wt, tail_urn in deck.perm_k(k=4):
+        firf = _DenseTable(self._nranks, 4)
+        firf_d = firf.data
+        score_lut = PutRules._SCORE_LUT
+        mask = self.__rules._joker_mask
+        for (myun1, myun2, mypl1, thpl1, ignore_wt, tail_urn), tail_pairs \
+                in zip(self._perm_list(4), self._tail_pairs(4)):
             if myun1 < myun2:
                 continue
             numr_win = 0
             numr_los = 0
             deno = 0
-            first_trick = self.__rules.score_trick(mypl1, thpl1)
-            for thun1, thun2, wt, _ in tail_urn.perm_k(k=2):
-                if wt <= 0:
-                    continue
-                if first_trick > 0:
-                    # we lead in the second trick
-                    # what should we lead with?
-                    mypl2, _, _, _ = secld[(max(myun1, myun2), min(myun1, myun2), mypl1, thpl1)]
+            first_trick = 1 if mypl1 > thpl1 else (-1 if mypl1 < thpl1 else 0)
+            # the first-trick outcome, my joker bit, their lead card's
+            # joker bit, and the score sub-plane are all fixed for the
+            # row, so the tail loop splits into a leading and a
+            # following body with the invariants resolved up front.
+            plane = score_lut[first_trick + 1]
+            jbase = ((((mask >> mypl1) | (mask >> myun1) | (mask >> myun2)) & 1) << 1) \
+                    | ((mask >> thpl1) & 1)
+            if first_trick > 0:
+                # we lead in the second trick; what we lead with does
+                # not depend on their remaining cards.
+                mypl2 = secld_c[myun1][myun2][mypl1][thpl1]
+                mypl3 = myun1 if mypl2 == myun2 else myun2
+                for thun1, thun2, wt in tail_pairs:
+                    # thun1 >= thun2 with both orderings folded into wt.
                     # what should they follow in the second trick with?
-                    thpl2, _, _, _ = alt_secfd[(max(thun1, thun2), min(thun1, thun2), thpl1, mypl1, mypl2)]
-                else:
-                    # first trick we tied or lost after following, so we follow
-                    # in the second.
+                    thpl2 = alt_secfd_c[thun1][thun2][thpl1][mypl1][mypl2]
+                    thpl3 = thun1 if thpl2 == thun2 else thun2
+                    t2 = 1 if mypl2 > thpl2 else (-1 if mypl2 < thpl2 else 0)
+                    t3 = 1 if mypl3 > thpl3 else (-1 if mypl3 < thpl3 else 0)
+                    outcome = plane[t2 + 1][t3 + 1][jbase | (((mask >> thun1) | (mask >> thun2)) & 1)]
+                    numr_win += wt * max(outcome, 0)
+                    numr_los -= wt * min(outcome, 0)
+                    deno += wt
+            else:
+                # first trick we tied or lost after following, so we
+                # follow in the second.
+                secfd_row = secfd_c[myun1][myun2][mypl1][thpl1]
+                for thun1, thun2, wt in tail_pairs:
                     # figure out what they would lead with
-                    thpl2, _, _, _ = alt_secld[(max(thun1, thun2), min(thun1, thun2), thpl1, mypl1)]
+                    thpl2 = alt_secld_c[thun1][thun2][thpl1][mypl1]
                     # what should we follow with in the second trick?
-                    mypl2, _, _, _ = secfd[(max(myun1, myun2), min(myun1, myun2), mypl1, thpl1, thpl2)]
-                mypl3 = myun1 if mypl2 == myun2 else myun2
-                thpl3 = thun1 if thpl2 == thun2 else thun2
-                outcome = self.__rules.score_from((mypl1, thpl1), (mypl2, thpl2), (mypl3, thpl3))
-                numr_win += wt * max(outcome, 0)
-                numr_los -= wt * min(outcome, 0)
-                deno += wt
+                    mypl2 = secfd_row[thpl2]
+                    mypl3 = myun1 if mypl2 == myun2 else myun2
+                    thpl3 = thun1 if thpl2 == thun2 else thun2
+                    t2 = 1 if mypl2 > thpl2 else (-1 if mypl2 < thpl2 else 0)
+                    t3 = 1 if mypl3 > thpl3 else (-1 if mypl3 < thpl3 else 0)
+                    outcome = plane[t2 + 1][t3 + 1][jbase | (((mask >> thun1) | (mask >> thun2)) & 1)]
+                    numr_win += wt * max(outcome, 0)
+                    numr_los -= wt * min(outcome, 0)
+                    deno += wt
             pr_win = numr_win / deno
             pr_los = numr_los / deno
-            firf[(myun1, myun2, mypl1, thpl1)] = (prob_win_con_tie + (wt_win * pr_win + wt_lose * pr_los), pr_win, pr_los)
+            firf_d[myun1][myun2][mypl1][thpl1] = (prob_win_con_tie + (wt_win * pr_win + wt_lose * pr_los), pr_win, pr_los)
         return firf
     @cache
     def first_trick_follower_decision(self, pw_tup):
@@ -394,17 +671,24 @@ class PutOptimalStrategy():
         decisions.
         By assumption unplayed1 >= unplayed2 and unplayed2 >= unplayed3
         """
-        firf = self.first_trick_follower_value(pw_tup=pw_tup)
-        firfd = {}
-        deck = self.__rules.deck
-        for myun1, myun2, myun3, thpl1, _, _ in deck.perm_k(k=4):
-            if (myun1 < myun2) or (myun2 < myun3):
-                continue
-            # value from playing 1, 2 or 3
-            val1 = firf[(myun2, myun3, myun1, thpl1)]
-            val2 = firf[(myun1, myun3, myun2, thpl1)]
-            val3 = firf[(myun1, myun2, myun3, thpl1)]
-            firfd[(myun1, myun2, myun3, thpl1)] = self._put_best([(myun1, *val1), (myun2, *val2), (myun3, *val3)])
+        firf_d = self.first_trick_follower_value(pw_tup=pw_tup).data
+        firfd = _DenseTable(self._nranks, 4)
+        firfd_d = firfd.data
+        firfd.cards = _nested_table(self._nranks, 4)
+        firfd_c = firfd.cards
+        ranks = self._ranks_desc
+        put_best3 = self._put_best3
+        for myun1, myun2, myun3 in itertools.combinations_with_replacement(ranks, 3):
+            for thpl1 in ranks:
+                # value from playing 1, 2 or 3
+                val1 = firf_d[myun2][myun3][myun1][thpl1]
+                if val1 is None:
+                    continue
+                val2 = firf_d[myun1][myun3][myun2][thpl1]
+                val3 = firf_d[myun1][myun2][myun3][thpl1]
+                best = put_best3((myun1, *val1), (myun2, *val2), (myun3, *val3))
+                firfd_d[myun1][myun2][myun3][thpl1] = best
+                firfd_c[myun1][myun2][myun3][thpl1] = best[0]
         return firfd
     @cache
     def first_trick_leader_value(self, pw_tup):
@@ -418,59 +702,70 @@ class PutOptimalStrategy():
         2FIX: have to modify this to also return the probability of winning or losing _this deal_.
         Probably have to do that for _all_ the functions, sadly.
         """
-        secld = self.second_trick_leader_decision(pw_tup=pw_tup)
-        secfd = self.second_trick_follower_decision(pw_tup=pw_tup)
+        secld_c = self.second_trick_leader_decision(pw_tup=pw_tup).cards
+        secfd_c = self.second_trick_follower_decision(pw_tup=pw_tup).cards
         # from your opponent's POV:
-        alt_secld = self.second_trick_leader_decision(pw_tup=self._opponent_tup(pw_tup))
-        alt_secfd = self.second_trick_follower_decision(pw_tup=self._opponent_tup(pw_tup))
+        alt_secld_c = self.second_trick_leader_decision(pw_tup=self._opponent_tup(pw_tup)).cards
+        alt_secfd_c = self.second_trick_follower_decision(pw_tup=self._opponent_tup(pw_tup)).cards
         # first round stuff; this is from your opponent's POV
-        firfd = self.first_trick_follower_decision(pw_tup=self._opponent_tup(pw_tup))
+        firfd_c = self.first_trick_follower_decision(pw_tup=self._opponent_tup(pw_tup)).cards
         wt_win, wt_lose, prob_win_con_tie = self._get_wts(pw_tup)
-        firl = {}
-        deck = self.__rules.deck
-        for myun1, myun2, mypl1, ignore_wt, tail_urn in deck.perm_k(k=3):
+        firl = _DenseTable(self._nranks, 3)
+        firl_d = firl.data
+        score_lut = PutRules._SCORE_LUT
+        mask = self.__rules._joker_mask
+        for (myun1, myun2, mypl1, ignore_wt, tail_urn), tail_triples \
+                in zip(self._perm_list(3), self._tail_triples(3)):
             if myun1 < myun2:
                 continue
             numr_win = 0
             numr_los = 0
             deno = 0
-            for thun1, thun2, thun3, wt,_ in tail_urn.perm_k(k=3):
-                if wt <= 0:
-                    continue
-                sord = sorted([thun1, thun2, thun3], reverse=True)
-                thpl1, _, _, _ = firfd[(*sord, mypl1)]
-                # get their unplayed cards.
-                if thpl1 == thun1:
-                    threm1, threm2 = (max(thun2, thun3), min(thun2, thun3))
-                elif thpl1 == thun2:
-                    threm1, threm2 = (max(thun1, thun3), min(thun1, thun3))
+            # all three of my cards are fixed for the row, so my joker
+            # bit and the rows of my own decision planes hoist out of
+            # the triple loop.
+            jbase = (((mask >> myun1) | (mask >> myun2) | (mask >> mypl1)) & 1) << 1
+            secld_row = secld_c[myun1][myun2][mypl1]
+            secfd_row = secfd_c[myun1][myun2][mypl1]
+            # every ordering of the same three opponent cards plays out
+            # identically, so iterate the cached descending triples with
+            # the count of ordered draws as the weight.
+            for sord, wt in tail_triples:
+                thpl1 = firfd_c[sord[0]][sord[1]][sord[2]][mypl1]
+                # get their unplayed cards, still in descending order.
+                if thpl1 == sord[0]:
+                    threm1, threm2 = (sord[1], sord[2])
+                elif thpl1 == sord[1]:
+                    threm1, threm2 = (sord[0], sord[2])
                 else:
-                    threm1, threm2 = (max(thun1, thun2), min(thun1, thun2))
-                first_trick = self.__rules.score_trick(mypl1, thpl1)
+                    threm1, threm2 = (sord[0], sord[1])
+                first_trick = 1 if mypl1 > thpl1 else (-1 if mypl1 < thpl1 else 0)
                 # depending on who wins first trick we have different leader/follower in second.
                 # actually this needs to be modified depending on who leads the
                 # trick, because they will have different wt_win and whatnot.
                 # sigh.
                 if first_trick >= 0:
                     # win or tie, I lead again
-                    mypl2, _, _, _ = secld[(myun1, myun2, mypl1, thpl1)]
+                    mypl2 = secld_row[thpl1]
                     # their response is:
-                    thpl2, _, _, _ = alt_secfd[(threm1, threm2, thpl1, mypl1, mypl2)]
+                    thpl2 = alt_secfd_c[threm1][threm2][thpl1][mypl1][mypl2]
                 else:
                     # they lead.
-                    thpl2, _, _, _ = alt_secld[(threm1, threm2, thpl1, mypl1)]
+                    thpl2 = alt_secld_c[threm1][threm2][thpl1][mypl1]
                     # my response should be
-                    mypl2, _, _, _ = secfd[(myun1, myun2, mypl1, thpl1, thpl2)]
-                    pass
+                    mypl2 = secfd_row[thpl1][thpl2]
                 mypl3 = myun1 if mypl2 == myun2 else myun2
                 thpl3 = threm1 if thpl2 == threm2 else threm2
-                outcome = self.__rules.score_from((mypl1, thpl1), (mypl2, thpl2), (mypl3, thpl3))
+                t2 = 1 if mypl2 > thpl2 else (-1 if mypl2 < thpl2 else 0)
+                t3 = 1 if mypl3 > thpl3 else (-1 if mypl3 < thpl3 else 0)
+                jcol = jbase | (((mask >> sord[0]) | (mask >> sord[1]) | (mask >> sord[2])) & 1)
+                outcome = score_lut[first_trick + 1][t2 + 1][t3 + 1][jcol]
                 numr_win += wt * max(outcome, 0)
                 numr_los -= wt * min(outcome, 0)
                 deno += wt
             pr_win = numr_win / deno
             pr_los = numr_los / deno
-            firl[(myun1, myun2, mypl1)] = (prob_win_con_tie + (wt_win * pr_win + wt_lose * pr_los), pr_win, pr_los)
+            firl_d[myun1][myun2][mypl1] = (prob_win_con_tie + (wt_win * pr_win + wt_lose * pr_los), pr_win, pr_los)
         return firl
     @cache
     def first_trick_leader_decision(self, pw_tup):
@@ -481,17 +776,22 @@ class PutOptimalStrategy():
         decisions.
         By assumption unplayed1 >= unplayed2 >= unplayed3
         """
-        firl = self.first_trick_leader_value(pw_tup=pw_tup)
-        firld = {}
-        deck = self.__rules.deck
-        for myun1, myun2, myun3, _, _ in deck.perm_k(k=3):
-            if (myun1 < myun2) or (myun2 < myun3):
-                continue
+        firl_d = self.first_trick_leader_value(pw_tup=pw_tup).data
+        firld = _DenseTable(self._nranks, 3)
+        firld_d = firld.data
+        firld.cards = _nested_table(self._nranks, 3)
+        firld_c = firld.cards
+        put_best3 = self._put_best3
+        for myun1, myun2, myun3 in itertools.combinations_with_replacement(self._ranks_desc, 3):
             # value from playing 1, 2 or 3
-            val1 = firl[(myun2, myun3, myun1)]
-            val2 = firl[(myun1, myun3, myun2)]
-            val3 = firl[(myun1, myun2, myun3)]
-            firld[(myun1, myun2, myun3)] = self._put_best([(myun1, *val1), (myun2, *val2), (myun3, *val3)])
+            val1 = firl_d[myun2][myun3][myun1]
+            if val1 is None:
+                continue
+            val2 = firl_d[myun1][myun3][myun2]
+            val3 = firl_d[myun1][myun2][myun3]
+            best = put_best3((myun1, *val1), (myun2, *val2), (myun3, *val3))
+            firld_d[myun1][myun2][myun3] = best
+            firld_c[myun1][myun2][myun3] = best[0]
         return firld
     @cache
     def first_trick_call_put_decision(self, pw_tup):
@@ -531,24 +831,24 @@ class PutOptimalStrategy():
         this is unconditional on move played. it is assumed that the first player plays their optimal card.
         By assumption unplayed1 >= unplayed2 >= unplayed3
         """
-        firld = self.first_trick_leader_decision(pw_tup=self._opponent_tup(pw_tup))
-        firfd = self.first_trick_follower_decision(pw_tup=pw_tup)
-        deck = self.__rules.deck
-        firfuv = {}
+        firld_c = self.first_trick_leader_decision(pw_tup=self._opponent_tup(pw_tup)).cards
+        firfd_d = self.first_trick_follower_decision(pw_tup=pw_tup).data
+        firfuv = _DenseTable(self._nranks, 3)
+        firfuv_d = firfuv.data
         # 2FIX: this should return pwin and plose of this deal ...
-        for myun1, myun2, myun3, ignore_wt, tail_urn in deck.perm_k(k=3):
+        for (myun1, myun2, myun3, ignore_wt, tail_urn), tail_triples \
+                in zip(self._perm_list(3), self._tail_triples(3)):
             if (myun1 < myun2) or (myun2 < myun3):
                 continue
             numr_win = 0
             deno = 0
-            for thun1, thun2, thun3, wt, _ in tail_urn.perm_k(k=3):
-                sord = tuple(sorted([thun1, thun2, thun3], reverse=True))
-                thpl1, _, _, _ = firld[sord]
-                _, this_pwin, _, _ = firfd[(myun1, myun2, myun3, thpl1)]
+            for sord, wt in tail_triples:
+                thpl1 = firld_c[sord[0]][sord[1]][sord[2]]
+                _, this_pwin, _, _ = firfd_d[myun1][myun2][myun3][thpl1]
                 deno += wt
                 numr_win += wt * this_pwin
             # need to add the pcon_win_con_tie part here...
-            firfuv[(myun1, myun2, myun3)] = numr_win / deno
+            firfuv_d[myun1][myun2][myun3] = numr_win / deno
         return firfuv
     def _save_something(self, outfile, header_row, save_dict):
         """
@@ -632,22 +932,55 @@ class PutOptimalStrategy():
         computes the probability that I will win the match, unconditional of the cards dealt, given that I lead this trick,
         and we have the given conditional probabilities of winning given the outcome of this deal.
         """
-        firld = self.first_trick_leader_decision(pw_tup)
+        firld_d = self.first_trick_leader_decision(self._quantize_pw(pw_tup)).data
         numr_win = 0
         deno = 0
-        deck = self.__rules.deck
-        for myun1, myun2, myun3, wt, _ in deck.perm_k(k=3):
-            mykey = tuple(sorted([myun1, myun2, myun3], reverse=True))
+        for myun1, myun2, myun3, wt, _ in self._perm_list(3):
+            mykey = sorted([myun1, myun2, myun3], reverse=True)
             deno += wt
-            numr_win += wt * firld[mykey][1]
+            numr_win += wt * firld_d[mykey[0]][mykey[1]][mykey[2]][1]
         return numr_win / deno
+    @cache
+    def deal_probs(self, pw_tup):
+        """
+        the unconditional probabilities of winning and losing this deal
+        when I lead, under the optimal play for the given conditionals.
+        """
+        firld_d = self.first_trick_leader_decision(self._quantize_pw(pw_tup)).data
+        numr_win = 0
+        numr_los = 0
+        deno = 0
+        for myun1, myun2, myun3, wt, _ in self._perm_list(3):
+            mykey = sorted([myun1, myun2, myun3], reverse=True)
+            _, _, pr_win, pr_los = firld_d[mykey[0]][mykey[1]][mykey[2]]
+            deno += wt
+            numr_win += wt * pr_win
+            numr_los += wt * pr_los
+        return (numr_win / deno, numr_los / deno)
     def iterate_tie_pwin(self, pw_start, max_iter=50, min_diff=1e-7, verbosity=0):
         """
-        iteratively update the middle value of pw_tup
+        iteratively update the middle value of pw_tup.
+
+        for a frozen strategy the match-win probability is linear in the
+        tie conditional x: prob_win(x) = a + p_tie * x where
+        a = pc_win * p_win + pc_lose * p_lose over the deal outcome
+        probabilities, so the recursion prob_win(x) + x = 1 collapses to
+        x = (1 - a) / (1 + p_tie) in closed form.  we alternate that
+        collapse with re-optimizing the strategy at the new x, rather
+        than root-finding on prob_win.
         """
-        ffunc = lambda x: self.prob_win(pw_tup=(pw_start[0], x, pw_start[2]))
-        x1 = root_polish(ffunc, pw_start[1], ytol=min_diff, xtol=min_diff, max_iter=max_iter, verbosity=verbosity)
-        return (pw_start[0], x1, pw_start[2])
+        x = pw_start[1]
+        for it in range(max_iter):
+            p_win, p_lose = self.deal_probs((pw_start[0], x, pw_start[2]))
+            p_tie = 1 - p_win - p_lose
+            x_next = (1 - pw_start[0] * p_win - pw_start[2] * p_lose) / (1 + p_tie)
+            if verbosity > 0:
+                print(f"{it}: {x} -> {x_next}")
+            if abs(x_next - x) < min_diff:
+                x = x_next
+                break
+            x = x_next
+        return (pw_start[0], x, pw_start[2])
 
 
 """
@@ -759,9 +1092,10 @@ afoo.save_second_trick_follower_decision("/tmp/put_fulldeck_jk_004.csv", pw_next
 
 
 
-# enum with ordering. See also Enum.OrderedEnum
-# https://stackoverflow.com/a/39269589/164611
-class PutCardOrder(Enum):
+# IntEnum gives the ordering natively as plain int compares, where the
+# old hand-rolled __lt__ paid an Enum dispatch per comparison; members
+# also index the dense strategy tables directly.
+class PutCardOrder(IntEnum):
     Four = 0
     Five = 1
     Six = 2
@@ -776,11 +1110,8 @@ class PutCardOrder(Enum):
     Two = 11
     Three = 12
     Joker = 13
-    def __lt__(self, other):
-        if self.__class__ is other.__class__:
-            return self.value < other.value
-        return NotImplemented
-    
+
+
 """
 put_deck = Urn(Counter({k:(4 if k != PutCardOrder.Joker else 2) for k in PutCardOrder}))
 put_short_deck = Urn(Counter({k:(4 if k != PutCardOrder.Joker else 0) for k in PutCardOrder}))
@@ -844,13 +1175,13 @@ class PutGame(StateMixin, HistoryMixin, AbstractSequentialGame):
         self.__tricks_won = [0, 0]
         self.__played_card = None
 
+    # maps (tally0 > 4) - (tally1 > 4) + 1 to the winner; runs after
+    # every completed deal so keep it a single branchless load.
+    _WIN_MAP = (1, None, 0)
+
     def _check_win(self):
-        if self.__tally[0] > 4:
-            self.__winner = 0
-        elif self.__tally[1] > 4:
-            self.__winner = 1
-        else:
-            self.__winner = None
+        tally = self.__tally
+        self.__winner = self._WIN_MAP[(tally[0] > 4) - (tally[1] > 4) + 1]
 
     @property
     def winner(self):
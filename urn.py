@@ -32,14 +32,25 @@ class Urn(Counter):
         total_count = sum(self.values())
         assert k <= total_count, f"cannot permute {k=} objects from {total_count}"
         deno = perm(total_count, k)
-        for atup in itertools.product(self.keys(), repeat=k):
-            wt = 1
-            acop = dict(self).copy()
-            for av in atup:
-                wt *= acop[av]
-                acop[av] -= 1
-            if wt != 0:
-                yield (*atup, wt/deno, type(self)(acop))
+        keys = list(self.keys())
+        counts = dict(self)
+        atup = [None] * k
+        # walk the positions recursively over one mutable count dict,
+        # accumulating the weight as we go: exhausted ranks prune their
+        # whole subtree, and nothing is copied until a tuple is yielded.
+        def _rec(depth, wt):
+            if depth == k:
+                yield (*atup, wt / deno, type(self)(counts))
+                return
+            for av in keys:
+                cnt = counts[av]
+                if cnt <= 0:
+                    continue
+                atup[depth] = av
+                counts[av] = cnt - 1
+                yield from _rec(depth + 1, wt * cnt)
+                counts[av] = cnt
+        yield from _rec(0, 1)
     def _generate_(self):
         """
         pick one from the urn, returning the tail urn
@@ -63,5 +74,92 @@ class Urn(Counter):
         return retv
 
 
+class ArrayUrn:
+    """
+    an urn over small non-negative integer ranks, keeping the counts in
+    a dense list indexed by rank rather than a Counter.  decrementing a
+    rank is one list store with no hashing, which the enumeration loops
+    care about.  mirrors the parts of the Urn interface the games and
+    strategy builders touch: keys, values, items, indexing, perm_k and
+    sample.
+    """
+    __slots__ = ('_counts', '_total')
+    def __init__(self, counts):
+        """
+        counts may be a mapping from rank to count, or a dense list of
+        counts indexed by rank.
+        """
+        if isinstance(counts, (list, tuple)):
+            dense = [int(c) for c in counts]
+        else:
+            dense = [0] * (max(int(k) for k in counts.keys()) + 1)
+            for k, v in counts.items():
+                dense[int(k)] = int(v)
+        self._counts = dense
+        self._total = sum(dense)
+    def __getitem__(self, rank):
+        return self._counts[rank]
+    def __len__(self):
+        return sum(1 for cnt in self._counts if cnt > 0)
+    def __repr__(self):
+        return f"{type(self).__name__}({self._counts})"
+    def keys(self):
+        return [rank for rank, cnt in enumerate(self._counts) if cnt > 0]
+    def values(self):
+        return [cnt for cnt in self._counts if cnt > 0]
+    def items(self):
+        return [(rank, cnt) for rank, cnt in enumerate(self._counts) if cnt > 0]
+    def copy(self):
+        return type(self)(self._counts)
+    def perm_k(self, k:int=1):
+        """
+        A generator over k-tuples of elements selected without replacement from the given counts.
+        This is a permutation generator, so the order matters.
+        Returns the k tuples, the probability of selecting that k-tuple, and an ArrayUrn object
+        with the items removed.
+        """
+        total_count = self._total
+        assert k <= total_count, f"cannot permute {k=} objects from {total_count}"
+        deno = perm(total_count, k)
+        counts = list(self._counts)
+        nranks = len(counts)
+        atup = [None] * k
+        # the same pruned recursion as Urn.perm_k, over the dense list.
+        def _rec(depth, wt):
+            if depth == k:
+                yield (*atup, wt / deno, type(self)(counts))
+                return
+            for av in range(nranks):
+                cnt = counts[av]
+                if cnt <= 0:
+                    continue
+                atup[depth] = av
+                counts[av] = cnt - 1
+                yield from _rec(depth + 1, wt * cnt)
+                counts[av] = cnt
+        yield from _rec(0, 1)
+    def _generate_(self):
+        """
+        pick one from the urn, returning the tail urn
+        """
+        choice = random.choices(range(len(self._counts)), weights=self._counts, k=1)
+        acop = list(self._counts)
+        acop[choice[0]] -= 1
+        return (choice, type(self)(acop))
+    def sample(self, k:int=1, replace:bool=False):
+        """
+        Sample from the urn, possibly with replacement, returning a list.
+        """
+        retv = []
+        tailself = self.copy()
+        for idx in range(k):
+            if replace:
+                choice, _ = tailself._generate_()
+            else:
+                choice, tailself = tailself._generate_()
+            retv.extend(choice)
+        return retv
+
+
 #for vim modeline: (do not edit)
 # vim:ts=4:sw=4:sts=4:tw=79:sta:et:ai:nu:fdm=indent:syn=python:ft=python:tag=.py_tags;:cin:fo=croql